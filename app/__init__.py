@@ -11,6 +11,14 @@ def create_app(config_class=Config):
     app = Flask(__name__, template_folder='../templates') 
     app.config.from_object(config_class)
     
+    # Fail at startup rather than on every save
+    from app.services.storage import COMPRESSION_PROFILES
+    if app.config['PPT_SAVE_PROFILE'] not in COMPRESSION_PROFILES:
+        raise ValueError(
+            f"Invalid PPT_SAVE_PROFILE {app.config['PPT_SAVE_PROFILE']!r}; "
+            f"expected one of: {', '.join(COMPRESSION_PROFILES)}"
+        )
+    
     # Initialize extensions
     db.init_app(app)
     login_manager.init_app(app)
@@ -18,26 +26,56 @@ def create_app(config_class=Config):
     login_manager.login_message = 'Please log in to access this page.'
     login_manager.login_message_category = 'info'
     
+    from app.services.admission import AdmissionController
+    app.extensions['admission'] = AdmissionController(
+        app.config['GENERATION_MEMORY_BUDGET'],
+        app.config['GENERATION_QUEUE_TIMEOUT'],
+        app.config['GENERATION_LEDGER']
+    )
+    
+    from app.services.idempotency import InFlightRegistry
+    app.extensions['inflight'] = InFlightRegistry(app.config['DUPLICATE_SUBMISSION_WAIT'])
+    
+    from app.services.version_diff import VersionDiffCache
+    app.extensions['version_diffs'] = VersionDiffCache(app.config['VERSION_DIFF_CACHE_SIZE'])
+    
+    from app.services.fragment_cache import FragmentCache
+    app.extensions['fragment_cache'] = FragmentCache(app.config['FRAGMENT_CACHE_MAX_BYTES'])
+    
     # Create necessary directories
     os.makedirs(os.path.join(app.instance_path, '..', 'database'), exist_ok=True)
     os.makedirs(os.path.join(app.instance_path, '..', 'storage', 'ppts'), exist_ok=True)
+    os.makedirs(os.path.join(app.instance_path, '..', 'storage', 'assets'), exist_ok=True)
     os.makedirs(os.path.join(app.instance_path, '..', 'static', 'images'), exist_ok=True)
+    os.makedirs(os.path.dirname(os.path.abspath(app.config['GENERATION_LEDGER'])), exist_ok=True)
     
     # Register blueprints
     from app.routes.auth import bp as auth_bp
     from app.routes.main import bp as main_bp
     from app.routes.user import bp as user_bp
     from app.routes.admin import bp as admin_bp
+    from app.routes.api import bp as api_bp
     
     app.register_blueprint(auth_bp)
     app.register_blueprint(main_bp)
     app.register_blueprint(user_bp, url_prefix='/user')
     app.register_blueprint(admin_bp, url_prefix='/admin')
+    app.register_blueprint(api_bp, url_prefix='/api')
+    
+    # Register CLI commands
+    from app.commands import register_commands
+    register_commands(app)
     
     # Create database tables
     with app.app_context():
         db.create_all()
         
+        from app.utils.schema import add_missing_columns
+        add_missing_columns(db)
+        
+        from app.services.fragment_cache import register_invalidation
+        register_invalidation()
+        
         # Create default admin user if not exists
         from app.models.user import User
         admin_user = User.query.filter_by(email='admin@company.com').first()
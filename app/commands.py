@@ -0,0 +1,136 @@
+import click
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from flask import current_app
+from app import db
+from app.models.presentation import Presentation
+from app.models.user import User
+from app.models.version import PresentationVersion
+from app.services.ppt_generator import PPTGeneratorService
+from app.services.storage import COMPRESSION_PROFILES, PresentationStorage
+from app.services import analytics
+
+
+def register_commands(app):
+    """Register maintenance commands with the ``flask`` CLI"""
+
+    @app.cli.command('migrate-storage')
+    @click.option('--batch-size', default=500, show_default=True, help='Versions moved per transaction.')
+    def migrate_storage(batch_size):
+        """Move existing presentation files into the sharded storage layout."""
+        storage = PresentationStorage()
+        moved = skipped = 0
+        last_id = 0
+        while True:
+            batch = PresentationVersion.query\
+                .filter(PresentationVersion.id > last_id)\
+                .order_by(PresentationVersion.id)\
+                .limit(batch_size)\
+                .all()
+            if not batch:
+                break
+            for version in batch:
+                new_path = storage.move_to_layout(version)
+                if new_path:
+                    version.file_path = new_path
+                    moved += 1
+                else:
+                    skipped += 1
+            # Commit per batch so a crash only leaves the current batch to redo
+            db.session.commit()
+            last_id = batch[-1].id
+            click.echo(f'Processed up to version id {last_id} ({moved} moved, {skipped} unchanged or missing)')
+        click.echo(f'Done: {moved} files moved, {skipped} skipped.')
+
+    @app.cli.command('bulk-review')
+    @click.argument('ids', nargs=-1, type=int)
+    @click.option('--status', type=click.Choice(['approved', 'rejected']), required=True)
+    @click.option('--reviewer', required=True, help='Email of the admin recorded as reviewer.')
+    @click.option('--notes', default=None, help='Review notes applied to every presentation.')
+    @click.option('--all-pending', is_flag=True, help='Review every pending presentation.')
+    def bulk_review(ids, status, reviewer, notes, all_pending):
+        """Approve or reject presentations in a single transaction."""
+        admin_user = User.query.filter_by(email=reviewer, role='admin').first()
+        if not admin_user:
+            raise click.ClickException(f'No admin user with email {reviewer}.')
+        ids = list(ids)
+        if all_pending:
+            ids += [row.id for row in db.session.query(Presentation.id).filter_by(status='pending')]
+        if not ids:
+            raise click.ClickException('No presentations selected.')
+
+        results = Presentation.bulk_review(ids, status, admin_user, notes)
+        for item in results:
+            click.echo(f"{item['id']}: {item['result']}")
+        updated = sum(1 for r in results if r['result'] != 'not_found')
+        click.echo(f'{updated} of {len(results)} presentations {status}.')
+
+    @app.cli.command('rebuild-analytics')
+    def rebuild_analytics():
+        """Recompute the review analytics rollups from scratch."""
+        rows = analytics.rebuild()
+        click.echo(f'Rebuilt {rows} rollup rows.')
+
+    @app.cli.command('archive-versions')
+    @click.option('--older-than-days', type=int, default=None,
+                  help='Only recompress versions older than this (default: ARCHIVE_AFTER_DAYS).')
+    @click.option('--batch-size', default=100, show_default=True, help='Versions recompressed per transaction.')
+    def archive_versions(older_than_days, batch_size):
+        """Recompress settled versions with the archive (maximum) compression profile."""
+        days = current_app.config['ARCHIVE_AFTER_DAYS'] if older_than_days is None else older_than_days
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        storage = PresentationStorage()
+        archived = saved_bytes = 0
+        last_id = 0
+        while True:
+            batch = PresentationVersion.query\
+                .filter(PresentationVersion.id > last_id,
+                        PresentationVersion.created_at < cutoff,
+                        db.or_(PresentationVersion.compression_profile.is_(None),
+                               PresentationVersion.compression_profile != 'archive'))\
+                .order_by(PresentationVersion.id)\
+                .limit(batch_size)\
+                .all()
+            if not batch:
+                break
+            for version in batch:
+                if not version.file_exists():
+                    continue
+                old_size = os.path.getsize(version.file_path)
+                version.file_size = storage.recompress(version.file_path, 'archive')
+                version.compression_profile = 'archive'
+                saved_bytes += old_size - version.file_size
+                archived += 1
+            db.session.commit()
+            last_id = batch[-1].id
+        click.echo(f'Recompressed {archived} versions, saving {saved_bytes / 1024:.1f} KB.')
+
+    @app.cli.command('benchmark-compression')
+    @click.option('--slides', default=40, show_default=True, help='Content slides in the synthetic deck.')
+    @click.option('--repeat', default=5, show_default=True, help='Saves per profile; the best time is reported.')
+    def benchmark_compression(slides, repeat):
+        """Report save time against file size for each compression profile."""
+        author = SimpleNamespace(username='benchmark', department='Benchmark')
+        deck = SimpleNamespace(id=0, title='Compression Benchmark', author=author,
+                               agenda='\n'.join(f'Topic {i}' for i in range(1, 6)))
+        slides_data = [
+            {'title': f'Slide {i}', 'content': '\n'.join(f'- Point {j} of slide {i} with some text' for j in range(8))}
+            for i in range(1, slides + 1)
+        ]
+        service = PPTGeneratorService()
+        storage = PresentationStorage()
+        prs = service.build_presentation(deck, slides_data)
+
+        click.echo(f"{'profile':<10}{'save ms':>10}{'size KB':>10}")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for profile in COMPRESSION_PROFILES:
+                path = os.path.join(tmp_dir, f'{profile}.pptx')
+                timings = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    storage.save_presentation(prs, path, profile)
+                    timings.append(time.perf_counter() - start)
+                click.echo(f'{profile:<10}{min(timings) * 1000:>10.1f}{os.path.getsize(path) / 1024:>10.1f}')
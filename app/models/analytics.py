@@ -0,0 +1,46 @@
+from app import db
+
+class ReviewRollup(db.Model):
+    """Daily review counters, maintained incrementally as submissions, versions and reviews happen.
+
+    Submission and version counters are stored on rows with ``reviewer_id`` 0;
+    review counters are stored per reviewer.
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=False)
+    department = db.Column(db.String(100), nullable=False, default='')
+    reviewer_id = db.Column(db.Integer, nullable=False, default=0)
+
+    submissions = db.Column(db.Integer, nullable=False, default=0)
+    versions_created = db.Column(db.Integer, nullable=False, default=0)
+    approvals = db.Column(db.Integer, nullable=False, default=0)
+    rejections = db.Column(db.Integer, nullable=False, default=0)
+    turnaround_seconds = db.Column(db.Float, nullable=False, default=0)  # Sum of submit-to-review times
+
+    COUNTERS = ('submissions', 'versions_created', 'approvals', 'rejections', 'turnaround_seconds')
+
+    def __repr__(self):
+        return f'<ReviewRollup {self.day} {self.department or "-"} reviewer={self.reviewer_id}>'
+
+    __table_args__ = (db.UniqueConstraint('day', 'department', 'reviewer_id'),)
+
+
+class ReviewEvent(db.Model):
+    """One review decision on one version of a presentation.
+
+    Each reviewed version counts once in the rollups, with its latest
+    decision: a new decision on the same version marks the earlier one
+    superseded and reverses its counters.
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    presentation_id = db.Column(db.Integer, db.ForeignKey('presentation.id'), nullable=False, index=True)
+    version_number = db.Column(db.Integer)
+    reviewer_id = db.Column(db.Integer, nullable=False, default=0)
+    department = db.Column(db.String(100), nullable=False, default='')  # Author's department at review time
+    status = db.Column(db.String(20), nullable=False)  # approved or rejected
+    reviewed_at = db.Column(db.DateTime, nullable=False)
+    turnaround_seconds = db.Column(db.Float, nullable=False, default=0)  # Version submitted to reviewed
+    superseded = db.Column(db.Boolean, nullable=False, default=False)
+
+    def __repr__(self):
+        return f'<ReviewEvent {self.presentation_id} v{self.version_number} {self.status}>'
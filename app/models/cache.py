@@ -0,0 +1,13 @@
+from app import db
+
+class DataGeneration(db.Model):
+    """Single-row counter bumped whenever presentations, versions or users change.
+
+    Cached fragments are keyed by the current value, so a bump invalidates
+    them in every worker process at once.
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<DataGeneration {self.value}>'
@@ -1,7 +1,11 @@
 from datetime import datetime
 import json
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import undefer_group
 from app import db
 from app.models.version import PresentationVersion
+from app.services import analytics
+from app.services.fragment_cache import bump_data_generation
 
 class Presentation(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -14,9 +18,9 @@ class Presentation(db.Model):
     # Author information
     author_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
 
-    # Presentation content
-    agenda = db.Column(db.Text)  # JSON string for agenda items
-    content_data = db.Column(db.Text)  # JSON string for all slide content
+    # Presentation content (deferred: only loaded where slides are actually shown or generated)
+    agenda = db.deferred(db.Column(db.Text), group='content')  # JSON string for agenda items
+    content_data = db.deferred(db.Column(db.Text), group='content')  # JSON string for all slide content
 
     # Admin review
     reviewed_by = db.Column(db.Integer, db.ForeignKey('user.id'))
@@ -25,6 +29,7 @@ class Presentation(db.Model):
 
     # Current version tracking
     current_version = db.Column(db.Integer, default=1)
+    version_counter = db.Column(db.Integer, default=1)  # Last allocated version number
 
     # Relationships
     author = db.relationship(
@@ -44,11 +49,62 @@ class Presentation(db.Model):
         cascade='all, delete-orphan'
     )
 
+    @classmethod
+    def query_with_content(cls):
+        """Query that loads the deferred agenda and slide content along with the row"""
+        return cls.query.options(undefer_group('content'))
+
+    def get_recent_versions(self, limit):
+        return self.versions.order_by(PresentationVersion.version_number.desc()).limit(limit).all()
+
+    def paginate_versions(self, page, per_page):
+        return self.versions.order_by(PresentationVersion.version_number.desc())\
+            .paginate(page=page, per_page=per_page, error_out=False)
+
     def get_current_version(self):
         return self.versions.filter_by(version_number=self.current_version).first()
 
     def get_latest_version(self):
         return self.versions.order_by(PresentationVersion.version_number.desc()).first()
+
+    def allocate_version_number(self):
+        """Atomically reserve the next version number and commit the reservation.
+
+        The counter is incremented in a single UPDATE, so concurrent editors
+        always get distinct numbers before any generation work starts. A
+        reservation whose generation fails simply leaves a gap.
+        """
+        table = Presentation.__table__
+        latest_number = select(func.max(PresentationVersion.version_number))\
+            .where(PresentationVersion.presentation_id == table.c.id)\
+            .scalar_subquery()
+        db.session.execute(
+            table.update()
+            .where(table.c.id == self.id)
+            .values(version_counter=func.coalesce(table.c.version_counter, latest_number, 0) + 1)
+        )
+        number = db.session.execute(
+            select(table.c.version_counter).where(table.c.id == self.id)
+        ).scalar()
+        db.session.commit()
+        return number
+
+    def apply_version(self, version_number, **values):
+        """Make ``version_number`` current and write the deck fields that describe it.
+
+        Everything is written in one conditional UPDATE that only matches while
+        no newer version is current, so a slow concurrent edit can never leave
+        the deck's content describing an older version than ``current_version``.
+        Does not commit. Returns True if the version became current.
+        """
+        table = Presentation.__table__
+        result = db.session.execute(
+            table.update()
+            .where(table.c.id == self.id)
+            .where(or_(table.c.current_version.is_(None), table.c.current_version < version_number))
+            .values(current_version=version_number, **values)
+        )
+        return result.rowcount == 1
         
     @property
     def slides(self):
@@ -73,6 +129,7 @@ class Presentation(db.Model):
         self.reviewed_at = datetime.utcnow()
         if notes:
             self.review_notes = notes
+        analytics.record_review(self, admin_user.id, self.status, self.reviewed_at)
         db.session.commit()
 
     def reject(self, admin_user, notes=None):
@@ -81,8 +138,57 @@ class Presentation(db.Model):
         self.reviewed_at = datetime.utcnow()
         if notes:
             self.review_notes = notes
+        analytics.record_review(self, admin_user.id, self.status, self.reviewed_at)
         db.session.commit()
 
+    @classmethod
+    def bulk_review(cls, ids, status, admin_user, notes=None):
+        """Approve or reject many presentations with one UPDATE in one transaction.
+
+        Returns a list of per-item results in the order of ``ids``.
+        """
+        if status not in ('approved', 'rejected'):
+            raise ValueError(f'Invalid review status: {status}')
+
+        from app.models.user import User
+
+        ids = list(dict.fromkeys(int(i) for i in ids))
+        rows = db.session.query(
+            cls.id, cls.status, cls.current_version, User.department, PresentationVersion.created_at
+        )\
+            .join(User, User.id == cls.author_id)\
+            .outerjoin(PresentationVersion, (PresentationVersion.presentation_id == cls.id)
+                       & (PresentationVersion.version_number == cls.current_version))\
+            .filter(cls.id.in_(ids))\
+            .all() if ids else []
+        previous = {row[0]: row[1] for row in rows}
+
+        if previous:
+            reviewed_at = datetime.utcnow()
+            values = {
+                'status': status,
+                'reviewed_by': admin_user.id,
+                'reviewed_at': reviewed_at
+            }
+            if notes:
+                values['review_notes'] = notes
+            db.session.query(cls)\
+                .filter(cls.id.in_(list(previous)))\
+                .update(values, synchronize_session=False)
+            analytics.record_bulk_review(
+                [(id, version_number, department, submitted_at)
+                 for id, _, version_number, department, submitted_at in rows],
+                admin_user.id, status, reviewed_at
+            )
+            # The bulk UPDATE bypasses flush tracking, so invalidate cached pages here
+            bump_data_generation()
+        db.session.commit()
+
+        return [
+            {'id': i, 'result': status if i in previous else 'not_found', 'previous_status': previous.get(i)}
+            for i in ids
+        ]
+
     def reset_to_pending(self):
         self.status = 'pending'
         self.reviewed_by = None
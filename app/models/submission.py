@@ -0,0 +1,15 @@
+from datetime import datetime
+from app import db
+
+class SubmissionClaim(db.Model):
+    """A create or edit submission being generated, visible to every worker process.
+
+    The row is committed before generation starts, so a duplicate submission
+    handled by another worker finds it, waits and reuses ``result``.
+    """
+    key = db.Column(db.String(200), primary_key=True)  # idempotency.submission_key()
+    result = db.Column(db.Integer)  # Presentation id or version number once generation succeeded
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+    def __repr__(self):
+        return f'<SubmissionClaim {self.key} result={self.result}>'
@@ -1,4 +1,5 @@
 from datetime import datetime
+import json
 import os
 from app import db
 
@@ -11,6 +12,7 @@ class PresentationVersion(db.Model):
     filename = db.Column(db.String(255), nullable=False)
     file_path = db.Column(db.String(500), nullable=False)
     file_size = db.Column(db.Integer)
+    compression_profile = db.Column(db.String(20))  # Zip profile the file was last written with
     
     # Version metadata
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -18,7 +20,11 @@ class PresentationVersion(db.Model):
     change_description = db.Column(db.Text)
     
     # Content snapshot (for rollback purposes)
-    content_snapshot = db.Column(db.Text)  # JSON string of content at this version
+    content_snapshot = db.deferred(db.Column(db.Text))  # JSON string of content at this version (loaded on access)
+    content_hash = db.Column(db.String(64))  # Normalized fingerprint of title, description, agenda and slides
+    idempotency_key = db.Column(db.String(64), index=True)  # Client submission key that produced this version
+    slide_hashes = db.Column(db.Text)  # JSON list of per-slide content hashes, in slide order
+    preview_html = db.deferred(db.Column(db.Text))  # Rendered HTML slide preview (loaded on access)
     
     # Relationships
     presentation = db.relationship(
@@ -31,6 +37,25 @@ class PresentationVersion(db.Model):
         back_populates='created_versions'
     )
     
+    def get_slides(self):
+        """Slides stored in the content snapshot"""
+        if not self.content_snapshot:
+            return []
+        try:
+            data = json.loads(self.content_snapshot)
+        except json.JSONDecodeError:
+            return []
+        if isinstance(data, dict):
+            data = data.get('slides', [])
+        return data if isinstance(data, list) else []
+
+    def get_slide_hashes(self):
+        """Per-slide hashes; computed from the snapshot for versions created before they were stored"""
+        if self.slide_hashes:
+            return json.loads(self.slide_hashes)
+        from app.services.version_diff import compute_slide_hashes
+        return compute_slide_hashes(self.get_slides())
+
     def get_file_size_mb(self):
         if self.file_size:
             return round(self.file_size / (1024 * 1024), 2)
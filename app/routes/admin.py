@@ -1,4 +1,4 @@
-from flask import Blueprint, render_template, redirect, url_for, flash, request, send_file
+from flask import Blueprint, render_template, redirect, url_for, flash, request, send_file, jsonify, current_app
 from flask_login import login_required, current_user
 from functools import wraps
 from datetime import datetime
@@ -6,7 +6,11 @@ from app import db
 from app.models.presentation import Presentation
 from app.models.version import PresentationVersion
 from app.models.user import User
-from app.utils.forms import ReviewForm
+from app.utils.forms import ReviewForm, BulkReviewForm
+from app.services.admission import get_admission_controller
+from app.services.version_diff import get_version_diff_cache
+from app.services import analytics
+from app.services.fragment_cache import get_fragment_cache
 
 bp = Blueprint('admin', __name__)
 
@@ -25,33 +29,51 @@ def admin_required(f):
 @admin_required
 def dashboard():
     """Admin dashboard with system overview"""
-    # Get statistics
-    stats = {
-        'total_presentations': Presentation.query.count(),
-        'pending_presentations': Presentation.query.filter_by(status='pending').count(),
-        'approved_presentations': Presentation.query.filter_by(status='approved').count(),
-        'rejected_presentations': Presentation.query.filter_by(status='rejected').count(),
-        'total_users': User.query.filter_by(role='user').count(),
-        'total_versions': PresentationVersion.query.count()
-    }
-    
-    # Recent presentations needing review
-    recent_pending = Presentation.query.filter_by(status='pending')\
-        .order_by(Presentation.created_at.desc())\
-        .limit(5)\
-        .all()
-    
-    # Recent activity
-    recent_activity = Presentation.query\
-        .order_by(Presentation.updated_at.desc())\
-        .limit(10)\
-        .all()
+    def render_body():
+        # Get statistics
+        stats = {
+            'total_presentations': Presentation.query.count(),
+            'pending_presentations': Presentation.query.filter_by(status='pending').count(),
+            'approved_presentations': Presentation.query.filter_by(status='approved').count(),
+            'rejected_presentations': Presentation.query.filter_by(status='rejected').count(),
+            'total_users': User.query.filter_by(role='user').count(),
+            'total_versions': PresentationVersion.query.count()
+        }
+        
+        # Recent presentations needing review
+        recent_pending = Presentation.query.filter_by(status='pending')\
+            .order_by(Presentation.created_at.desc())\
+            .limit(5)\
+            .all()
+        
+        # Recent activity
+        recent_activity = Presentation.query\
+            .order_by(Presentation.updated_at.desc())\
+            .limit(10)\
+            .all()
+        
+        return render_template('admin/_dashboard_body.html', 
+                             stats=stats, 
+                             recent_presentations=recent_activity,
+                             recent_pending=recent_pending,
+                             recent_activity=recent_activity)
     
-    return render_template('admin/dashboard.html', 
-                         stats=stats, 
-                         recent_presentations=recent_activity,  # <-- add this line
-                         recent_pending=recent_pending,
-                         recent_activity=recent_activity)
+    body = get_fragment_cache().get_or_render('admin.dashboard', render_body)
+    return render_template('admin/dashboard.html', body=body)
+
+@bp.route('/admission')
+@login_required
+@admin_required
+def admission_status():
+    """Current memory budget usage of presentation generation in this worker"""
+    return jsonify(get_admission_controller().usage())
+
+@bp.route('/cache')
+@login_required
+@admin_required
+def cache_status():
+    """Fragment cache hit/miss statistics for this worker"""
+    return jsonify(get_fragment_cache().stats())
 
 @bp.route('/presentations')
 @login_required
@@ -61,17 +83,58 @@ def list_presentations():
     status_filter = request.args.get('status', 'all')
     page = request.args.get('page', 1, type=int)
     
-    query = Presentation.query
+    def render_rows():
+        query = Presentation.query
+        
+        if status_filter != 'all':
+            query = query.filter_by(status=status_filter)
+        
+        presentations = query.order_by(Presentation.created_at.desc())\
+            .paginate(page=page, per_page=20, error_out=False)
+        return render_template('admin/_presentations_rows.html', presentations=presentations)
     
-    if status_filter != 'all':
-        query = query.filter_by(status=status_filter)
+    rows = get_fragment_cache().get_or_render(f'admin.presentations:{status_filter}:{page}', render_rows)
+    return render_template('admin/presentations.html', 
+                         rows=rows, 
+                         status_filter=status_filter,
+                         bulk_form=BulkReviewForm())
+
+@bp.route('/presentations/bulk-review', methods=['POST'])
+@login_required
+@admin_required
+def bulk_review():
+    """Approve or reject a set of presentations in a single transaction"""
+    if request.is_json:
+        payload = request.get_json(silent=True) or {}
+        ids = payload.get('ids') or []
+        status = payload.get('status')
+        notes = payload.get('notes')
+        if status not in ('approved', 'rejected') or not isinstance(ids, list):
+            return jsonify({'error': "Expected 'ids' (list) and 'status' ('approved' or 'rejected')."}), 400
+    else:
+        form = BulkReviewForm()
+        if not form.validate_on_submit():
+            flash('Invalid bulk review request.', 'error')
+            return redirect(url_for('admin.list_presentations'))
+        ids = request.form.getlist('presentation_ids')
+        status = form.status.data
+        notes = form.feedback.data
     
-    presentations = query.order_by(Presentation.created_at.desc())\
-        .paginate(page=page, per_page=20, error_out=False)
+    try:
+        results = Presentation.bulk_review(ids, status, current_user, notes)
+    except (TypeError, ValueError):
+        db.session.rollback()
+        if request.is_json:
+            return jsonify({'error': 'Presentation ids must be integers.'}), 400
+        flash('Invalid presentation selection.', 'error')
+        return redirect(url_for('admin.list_presentations'))
     
-    return render_template('admin/presentations.html', 
-                         presentations=presentations, 
-                         status_filter=status_filter)
+    if request.is_json:
+        return jsonify({'results': results})
+    
+    updated = sum(1 for r in results if r['result'] != 'not_found')
+    flash(f'{updated} presentation(s) {status}.', 'success')
+    return redirect(url_for('admin.list_presentations', status=request.args.get('status', 'all')))
 
 @bp.route('/presentation/<int:id>/review', methods=['GET', 'POST'])
 @login_required
@@ -88,6 +151,7 @@ def review_presentation(id):
         presentation.reviewed_by = current_user.id
         
         try:
+            analytics.record_review(presentation, current_user.id, presentation.status, presentation.reviewed_at)
             db.session.commit()
             flash(f'Presentation "{presentation.title}" has been {form.status.data}.', 'success')
             return redirect(url_for('admin.dashboard'))
@@ -100,8 +164,8 @@ def review_presentation(id):
         form.feedback.data = presentation.review_notes
         form.status.data = presentation.status
     
-    # Get all versions
-    versions = presentation.versions.order_by(PresentationVersion.version_number.desc()).all()
+    # Get the most recent versions; full history is paged on the versions page
+    versions = presentation.get_recent_versions(current_app.config['MAX_VERSIONS_DISPLAY'])
     
     return render_template('admin/review.html', 
                          presentation=presentation, 
@@ -114,9 +178,25 @@ def review_presentation(id):
 def view_versions(id):
     """View all versions of a presentation"""
     presentation = Presentation.query.get_or_404(id)
-    versions = presentation.versions.order_by(PresentationVersion.version_number.desc()).all()
+    page = request.args.get('page', 1, type=int)
+    versions = presentation.paginate_versions(page, per_page=20)
     return render_template('admin/versions.html', presentation=presentation, versions=versions)
 
+@bp.route('/presentation/<int:id>/diff/<int:old_number>/<int:new_number>')
+@login_required
+@admin_required
+def version_diff(id, old_number, new_number):
+    """Show what changed between two versions of a presentation"""
+    presentation = Presentation.query.get_or_404(id)
+    # Version numbers can have gaps, so fall back to the closest earlier version
+    old_version = presentation.versions\
+        .filter(PresentationVersion.version_number <= old_number)\
+        .order_by(PresentationVersion.version_number.desc())\
+        .first_or_404()
+    new_version = presentation.versions.filter_by(version_number=new_number).first_or_404()
+    diff = get_version_diff_cache().get_diff(old_version, new_version)
+    return render_template('admin/diff.html', presentation=presentation, diff=diff)
+
 @bp.route('/presentation/<int:presentation_id>/rollback/<int:version_number>', methods=['POST'])
 @login_required
 @admin_required
@@ -141,6 +221,22 @@ def rollback_version(presentation_id, version_number):
         flash(f'Error rolling back version: {str(e)}', 'error')
     return redirect(url_for('admin.view_versions', id=presentation_id))
 
+@bp.route('/analytics')
+@login_required
+@admin_required
+def analytics_dashboard():
+    """Review turnaround and approval metrics"""
+    days = min(max(request.args.get('days', 30, type=int), 1), 365)
+    return render_template('admin/analytics.html', summary=analytics.summarize(days))
+
+@bp.route('/api/analytics')
+@login_required
+@admin_required
+def analytics_api():
+    """Review metrics as JSON"""
+    days = min(max(request.args.get('days', 30, type=int), 1), 365)
+    return jsonify(analytics.summarize(days))
+
 @bp.route('/users')
 @login_required
 @admin_required
@@ -0,0 +1,198 @@
+from flask import Blueprint, jsonify, request, make_response
+from flask_login import current_user
+from functools import wraps
+from hashlib import sha1
+from app import db
+from app.models.presentation import Presentation
+from app.models.version import PresentationVersion
+from app.services.fragment_cache import get_data_generation
+
+bp = Blueprint('api', __name__)
+
+# Columns that may be requested with ?fields=; content blobs are never exposed here
+PRESENTATION_FIELDS = {
+    name: getattr(Presentation, name) for name in (
+        'id', 'title', 'description', 'status', 'created_at', 'updated_at', 'author_id',
+        'reviewed_by', 'reviewed_at', 'review_notes', 'current_version'
+    )
+}
+VERSION_FIELDS = {
+    name: getattr(PresentationVersion, name) for name in (
+        'id', 'presentation_id', 'version_number', 'filename', 'file_size', 'created_at',
+        'created_by', 'change_description', 'content_hash', 'compression_profile'
+    )
+}
+DEFAULT_PRESENTATION_FIELDS = ('id', 'title', 'status', 'current_version', 'updated_at')
+DEFAULT_VERSION_FIELDS = ('version_number', 'file_size', 'created_at', 'change_description')
+STATUS_FIELDS = ('id', 'status', 'current_version', 'updated_at', 'reviewed_at', 'review_notes')
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+class ApiError(Exception):
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@bp.errorhandler(ApiError)
+def handle_api_error(e):
+    return jsonify({'error': str(e)}), e.status_code
+
+
+def api_login_required(f):
+    """Like login_required, but answers 401 JSON instead of redirecting to the login page"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not current_user.is_authenticated:
+            return jsonify({'error': 'Authentication required.'}), 401
+        return f(*args, **kwargs)
+    return decorated_function
+
+
+def _parse_fields(allowed, default):
+    """Columns selected by ?fields=a,b; id is always included for cursors"""
+    requested = request.args.get('fields')
+    names = [n.strip() for n in requested.split(',') if n.strip()] if requested else list(default)
+    unknown = [n for n in names if n not in allowed]
+    if unknown:
+        raise ApiError(f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(sorted(allowed))}")
+    if 'id' not in names:
+        names.insert(0, 'id')
+    return names
+
+
+def _parse_page():
+    limit = request.args.get('limit', DEFAULT_LIMIT, type=int)
+    cursor = request.args.get('cursor', type=int)
+    return min(max(limit, 1), MAX_LIMIT), cursor
+
+
+def _serialize(names, row):
+    item = {}
+    for name, value in zip(names, row):
+        item[name] = value.isoformat() if hasattr(value, 'isoformat') else value
+    return item
+
+
+def _not_modified(etag):
+    """Return a 304 response if the client already has this representation"""
+    if request.if_none_match.contains(etag):
+        response = make_response('', 304)
+        response.set_etag(etag)
+        return response
+    return None
+
+
+def _json_with_etag(payload, etag):
+    response = jsonify(payload)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def _collection_etag(scope):
+    # The data generation changes on every write to presentations or versions,
+    # including rollbacks that move updated_at backwards
+    key = f'{get_data_generation()}:{scope}:{current_user.id}:{request.query_string.decode()}'
+    return sha1(key.encode('utf-8')).hexdigest()
+
+
+def _get_accessible(id):
+    """Load only the columns needed for permission and ETag checks"""
+    row = db.session.query(
+        Presentation.id, Presentation.author_id, Presentation.updated_at,
+        Presentation.status, Presentation.current_version, Presentation.reviewed_at
+    ).filter(Presentation.id == id).first()
+    if row is None or (not current_user.is_admin() and row.author_id != current_user.id):
+        raise ApiError('Presentation not found.', 404)
+    return row
+
+
+def _presentation_etag(row, fields):
+    key = f'{row.id}:{row.updated_at}:{row.status}:{row.current_version}:{row.reviewed_at}:{",".join(fields)}'
+    return sha1(key.encode('utf-8')).hexdigest()
+
+
+@bp.route('/presentations')
+@api_login_required
+def list_presentations():
+    """Presentations visible to the current user, newest first, with cursor pagination"""
+    fields = _parse_fields(PRESENTATION_FIELDS, DEFAULT_PRESENTATION_FIELDS)
+    limit, cursor = _parse_page()
+
+    etag = _collection_etag('presentations')
+    not_modified = _not_modified(etag)
+    if not_modified:
+        return not_modified
+
+    query = db.session.query(*[PRESENTATION_FIELDS[n] for n in fields])
+    if not current_user.is_admin():
+        query = query.filter(Presentation.author_id == current_user.id)
+    status = request.args.get('status')
+    if status:
+        query = query.filter(Presentation.status == status)
+    if cursor:
+        query = query.filter(Presentation.id < cursor)
+    rows = query.order_by(Presentation.id.desc()).limit(limit + 1).all()
+
+    items = [_serialize(fields, row) for row in rows[:limit]]
+    next_cursor = items[-1]['id'] if len(rows) > limit else None
+    return _json_with_etag({'items': items, 'next_cursor': next_cursor}, etag)
+
+
+@bp.route('/presentations/<int:id>')
+@api_login_required
+def get_presentation(id):
+    fields = _parse_fields(PRESENTATION_FIELDS, DEFAULT_PRESENTATION_FIELDS)
+    row = _get_accessible(id)
+
+    etag = _presentation_etag(row, fields)
+    not_modified = _not_modified(etag)
+    if not_modified:
+        return not_modified
+
+    values = db.session.query(*[PRESENTATION_FIELDS[n] for n in fields]).filter(Presentation.id == id).one()
+    return _json_with_etag(_serialize(fields, values), etag)
+
+
+@bp.route('/presentations/<int:id>/status')
+@api_login_required
+def get_status(id):
+    """Minimal payload for polling a submission's review status"""
+    row = _get_accessible(id)
+
+    etag = _presentation_etag(row, STATUS_FIELDS)
+    not_modified = _not_modified(etag)
+    if not_modified:
+        return not_modified
+
+    values = db.session.query(*[PRESENTATION_FIELDS[n] for n in STATUS_FIELDS]).filter(Presentation.id == id).one()
+    return _json_with_etag(_serialize(STATUS_FIELDS, values), etag)
+
+
+@bp.route('/presentations/<int:id>/versions')
+@api_login_required
+def list_versions(id):
+    """Versions of a presentation, newest first, with cursor pagination on version number"""
+    fields = _parse_fields(VERSION_FIELDS, DEFAULT_VERSION_FIELDS)
+    if 'version_number' not in fields:
+        fields.append('version_number')
+    limit, cursor = _parse_page()
+    _get_accessible(id)
+
+    etag = _collection_etag(f'versions:{id}')
+    not_modified = _not_modified(etag)
+    if not_modified:
+        return not_modified
+
+    query = db.session.query(*[VERSION_FIELDS[n] for n in fields])\
+        .filter(PresentationVersion.presentation_id == id)
+    if cursor:
+        query = query.filter(PresentationVersion.version_number < cursor)
+    rows = query.order_by(PresentationVersion.version_number.desc()).limit(limit + 1).all()
+
+    items = [_serialize(fields, row) for row in rows[:limit]]
+    next_cursor = items[-1]['version_number'] if len(rows) > limit else None
+    return _json_with_etag({'items': items, 'next_cursor': next_cursor}, etag)
@@ -1,13 +1,23 @@
-from flask import Blueprint, render_template, redirect, url_for, flash, request, send_file, jsonify
+from flask import Blueprint, render_template, redirect, url_for, flash, request, send_file, jsonify, current_app, make_response, abort
 from flask_login import login_required, current_user
+from sqlalchemy.orm import undefer
 from app import db
 from app.models.presentation import Presentation
 from app.models.version import PresentationVersion
 from app.utils.forms import PresentationForm
 from app.services.ppt_generator import PPTGeneratorService
+from app.services.asset_cache import AssetCache, AssetError
+from app.services.admission import AdmissionRejected, get_admission_controller
+from app.services.idempotency import content_fingerprint, get_inflight_registry, submission_key
+from app.services.version_diff import compute_slide_hashes
+from app.services import analytics
+from app.services.fragment_cache import get_fragment_cache
+from app.services.preview import get_preview, preview_etag
 import json
 import os
+import uuid
 from datetime import datetime
+from types import SimpleNamespace
 
 bp = Blueprint('user', __name__)
 
@@ -18,23 +28,27 @@ def dashboard():
     if current_user.is_admin():
         return redirect(url_for('admin.dashboard'))
     
-    # Get user's presentations with pagination
     page = request.args.get('page', 1, type=int)
-    presentations = current_user.authored_presentations.order_by(
-        Presentation.created_at.desc()
-    ).paginate(
-        page=page, per_page=10, error_out=False
-    )
     
-    # Statistics
-    stats = {
-        'total': current_user.authored_presentations.count(),
-        'pending': current_user.authored_presentations.filter_by(status='pending').count(),
-        'approved': current_user.authored_presentations.filter_by(status='approved').count(),
-        'rejected': current_user.authored_presentations.filter_by(status='rejected').count()
-    }
+    def render_body():
+        # Get user's presentations with pagination
+        presentations = current_user.authored_presentations.order_by(
+            Presentation.created_at.desc()
+        ).paginate(
+            page=page, per_page=10, error_out=False
+        )
+        
+        # Statistics
+        stats = {
+            'total': current_user.authored_presentations.count(),
+            'pending': current_user.authored_presentations.filter_by(status='pending').count(),
+            'approved': current_user.authored_presentations.filter_by(status='approved').count(),
+            'rejected': current_user.authored_presentations.filter_by(status='rejected').count()
+        }
+        return render_template('user/_dashboard_body.html', presentations=presentations, stats=stats)
     
-    return render_template('user/dashboard.html', presentations=presentations, stats=stats)
+    body = get_fragment_cache().get_or_render(f'user.dashboard:{current_user.id}:{page}', render_body)
+    return render_template('user/dashboard.html', body=body)
 
 @bp.route('/create', methods=['GET', 'POST'])
 @login_required
@@ -51,76 +65,158 @@ def create_presentation():
             # Parse slides data from JSON
             slides_data = json.loads(form.slides_data.data)
             
-            # Create presentation record
-            presentation = Presentation(
-                title=form.title.data,
-                description=form.description.data,
-                agenda=form.agenda.data,
-                content_data=json.dumps(slides_data),
-                author_id=current_user.id
+            fingerprint = content_fingerprint(
+                form.title.data, form.description.data, form.agenda.data, slides_data
             )
+            idempotency_key = (form.idempotency_key.data or request.headers.get('Idempotency-Key') or '')[:64] or None
             
-            db.session.add(presentation)
-            db.session.flush()  # Get the presentation ID
+            # A retried submission that already completed returns the existing result
+            if idempotency_key:
+                previous = PresentationVersion.query.filter_by(
+                    created_by=current_user.id, idempotency_key=idempotency_key
+                ).first()
+                if previous and previous.content_hash == fingerprint:
+                    flash('This presentation was already submitted.', 'info')
+                    return redirect(url_for('user.view_presentation', id=previous.presentation_id))
+                if previous:
+                    # A stale form resubmitted with different content is a new submission
+                    idempotency_key = uuid.uuid4().hex
             
-            # Generate PPT file
-            ppt_service = PPTGeneratorService()
-            file_path, filename = ppt_service.generate_presentation(
-                presentation, slides_data
-            )
+            key = submission_key(current_user.id, idempotency_key, fingerprint)
+            with get_inflight_registry().claim(key, retain=bool(idempotency_key)) as submission:
+                if submission.result is not None:
+                    flash('This presentation was already submitted.', 'info')
+                    return redirect(url_for('user.view_presentation', id=submission.result))
+                
+                # Reserve memory for the generation before touching the database
+                admission = get_admission_controller()
+                cost = admission.estimate_cost(
+                    slides_data, form.title.data, form.description.data, form.agenda.data
+                )
+                with admission.admit(cost):
+                    # Create presentation record
+                    presentation = Presentation(
+                        title=form.title.data,
+                        description=form.description.data,
+                        agenda=form.agenda.data,
+                        content_data=json.dumps(slides_data),
+                        author_id=current_user.id
+                    )
             
-            # Create initial version
-            version = PresentationVersion(
-                presentation_id=presentation.id,
-                version_number=1,
-                filename=filename,
-                file_path=file_path,
-                file_size=os.path.getsize(file_path),
-                created_by=current_user.id,
-                change_description='Initial version',
-                content_snapshot=json.dumps(slides_data)
-            )
+                    db.session.add(presentation)
+                    db.session.flush()  # Get the presentation ID
+            
+                    # Generate PPT file
+                    ppt_service = PPTGeneratorService()
+                    file_path, filename = ppt_service.generate_presentation(
+                        presentation, slides_data
+                    )
             
-            db.session.add(version)
-            db.session.commit()
+                    # Create initial version
+                    version = PresentationVersion(
+                        presentation_id=presentation.id,
+                        version_number=1,
+                        filename=filename,
+                        file_path=file_path,
+                        file_size=os.path.getsize(file_path),
+                        compression_profile=ppt_service.save_profile,
+                        created_by=current_user.id,
+                        change_description='Initial version',
+                        content_snapshot=json.dumps(slides_data),
+                        slide_hashes=json.dumps(compute_slide_hashes(slides_data)),
+                        content_hash=fingerprint,
+                        idempotency_key=idempotency_key,
+                        preview_html=ppt_service.render_preview(presentation, slides_data)
+                    )
             
-            flash('Presentation created successfully! It is now pending review.', 'success')
-            return redirect(url_for('user.view_presentation', id=presentation.id))
+                    db.session.add(version)
+                    analytics.record_submission(presentation)
+                    db.session.commit()
+            
+                submission.result = presentation.id
+                flash('Presentation created successfully! It is now pending review.', 'success')
+                return redirect(url_for('user.view_presentation', id=presentation.id))
             
         except json.JSONDecodeError:
             flash('Invalid slides data format.', 'error')
+        except AdmissionRejected as e:
+            db.session.rollback()
+            flash('The server is busy generating other presentations. Please try again shortly.', 'warning')
+            return render_template('user/create.html', form=form), 503, {'Retry-After': str(e.retry_after)}
         except Exception as e:
             db.session.rollback()
             flash(f'Error creating presentation: {str(e)}', 'error')
     
+    if not form.idempotency_key.data:
+        form.idempotency_key.data = uuid.uuid4().hex
+    
     return render_template('user/create.html', form=form)
 
+@bp.route('/assets', methods=['POST'])
+@login_required
+def upload_asset():
+    """Upload a slide image; returns the asset id to reference from slide data"""
+    upload = request.files.get('image')
+    if not upload:
+        return jsonify({'error': 'No image provided.'}), 400
+    
+    try:
+        asset_id = AssetCache().store(upload.read())
+    except AssetError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({'asset_id': asset_id})
+
+@bp.route('/assets/<asset_id>')
+@login_required
+def view_asset(asset_id):
+    """Serve a processed slide image; assets are content-addressed, so they can be cached indefinitely"""
+    path = AssetCache().get_path(asset_id)
+    if not path:
+        abort(404)
+    response = send_file(path, max_age=31536000, etag=asset_id)
+    response.cache_control.public = False
+    response.cache_control.private = True
+    return response
+
 @bp.route('/presentation/<int:id>')
 @login_required
 def view_presentation(id):
     """View a specific presentation"""
-    presentation = Presentation.query.get_or_404(id)
+    # The page shows the agenda but not the slides, so leave content_data deferred
+    presentation = Presentation.query.options(undefer(Presentation.agenda)).get_or_404(id)
     
     # Check if user owns the presentation or is admin
     if not current_user.is_admin() and presentation.author_id != current_user.id:
         flash('You do not have permission to view this presentation.', 'error')
         return redirect(url_for('user.dashboard'))
     
-    # Debug: Print content_data
-    print("Content Data:", presentation.content_data)
-    if presentation.content_data:
-        try:
-            print("Parsed Content:", json.loads(presentation.content_data))
-        except json.JSONDecodeError as e:
-            print("JSON Parse Error:", str(e))
-    
-    # Get versions
-    versions = presentation.versions.order_by(PresentationVersion.version_number.desc()).all()
+    # Get the most recent versions
+    versions = presentation.get_recent_versions(current_app.config['MAX_VERSIONS_DISPLAY'])
     
     return render_template('user/view_presentation.html', 
                          presentation=presentation, 
                          versions=versions)
 
+@bp.route('/presentation/<int:id>/preview/<int:version_number>')
+@login_required
+def preview_version(id, version_number):
+    """HTML slide preview of one version, so it can be reviewed without downloading the file"""
+    presentation = Presentation.query.get_or_404(id)
+    if not current_user.is_admin() and presentation.author_id != current_user.id:
+        abort(403)
+    
+    version = presentation.versions.filter_by(version_number=version_number).first_or_404()
+    
+    etag = preview_etag(version)
+    if request.if_none_match.contains(etag):
+        response = make_response('', 304)
+    else:
+        response = make_response(get_preview(version))
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, max-age=86400'
+    return response
+
 @bp.route('/download/<int:presentation_id>/<int:version_number>')
 @login_required
 def download_presentation(presentation_id, version_number):
@@ -154,7 +250,7 @@ def download_presentation(presentation_id, version_number):
 @login_required
 def edit_presentation(id):
     """Edit an existing presentation (creates a new version)"""
-    presentation = Presentation.query.get_or_404(id)
+    presentation = Presentation.query_with_content().get_or_404(id)
     if presentation.author_id != current_user.id:
         flash('You do not have permission to edit this presentation.', 'error')
         return redirect(url_for('user.dashboard'))
@@ -170,40 +266,92 @@ def edit_presentation(id):
         try:
             # Parse slides data from JSON
             slides_data = json.loads(form.slides_data.data)
-            # Update presentation fields
-            presentation.title = form.title.data
-            presentation.description = form.description.data
-            presentation.agenda = form.agenda.data
-            presentation.content_data = json.dumps(slides_data)
-            presentation.updated_at = datetime.utcnow()
-            # Generate new PPT file
-            ppt_service = PPTGeneratorService()
-            file_path, filename = ppt_service.generate_presentation(presentation, slides_data)
-            # Increment version number
-            latest_version = presentation.get_latest_version()
-            new_version_number = (latest_version.version_number + 1) if latest_version else 1
-            # Create new version record
-            version = PresentationVersion(
-                presentation_id=presentation.id,
-                version_number=new_version_number,
-                filename=filename,
-                file_path=file_path,
-                file_size=os.path.getsize(file_path),
-                created_by=current_user.id,
-                change_description='Edited by user',
-                content_snapshot=json.dumps(slides_data)
+            fingerprint = content_fingerprint(
+                form.title.data, form.description.data, form.agenda.data, slides_data
             )
-            db.session.add(version)
-            presentation.current_version = new_version_number
-            # Update presentation's file info to match the new version
-            presentation_file_attrs = ['filename', 'file_path', 'file_size']
-            for attr in presentation_file_attrs:
-                setattr(presentation, attr, getattr(version, attr, None))
-            db.session.commit()
-            flash('Presentation updated successfully! A new version has been created.', 'success')
-            return redirect(url_for('user.view_presentation', id=presentation.id))
+            idempotency_key = (form.idempotency_key.data or request.headers.get('Idempotency-Key') or '')[:64] or None
+            
+            # Nothing changed since the current version, or this exact edit was already saved
+            current_version = presentation.get_current_version()
+            if current_version and current_version.content_hash == fingerprint:
+                flash('No changes detected. The current version was kept.', 'info')
+                return redirect(url_for('user.view_presentation', id=presentation.id))
+            previous = presentation.versions.filter_by(idempotency_key=idempotency_key).first() \
+                if idempotency_key else None
+            if previous and previous.content_hash == fingerprint:
+                flash('These changes were already saved.', 'info')
+                return redirect(url_for('user.view_presentation', id=presentation.id))
+            if previous:
+                # A stale form resubmitted with different content is a new edit
+                idempotency_key = uuid.uuid4().hex
+            
+            key = submission_key(current_user.id, idempotency_key, fingerprint)
+            with get_inflight_registry().claim(key, retain=bool(idempotency_key)) as submission:
+                if submission.result is not None:
+                    flash('These changes were already saved.', 'info')
+                    return redirect(url_for('user.view_presentation', id=presentation.id))
+                
+                # Reserve memory for the generation before touching the database
+                admission = get_admission_controller()
+                cost = admission.estimate_cost(
+                    slides_data, form.title.data, form.description.data, form.agenda.data
+                )
+                with admission.admit(cost):
+                    # Reserve the version number up front so a conflict never costs a generation
+                    new_version_number = presentation.allocate_version_number()
+                    # Generate from the submitted fields without touching the loaded row;
+                    # they are only written to the deck if this version becomes current
+                    deck = SimpleNamespace(
+                        id=presentation.id,
+                        title=form.title.data,
+                        description=form.description.data,
+                        agenda=form.agenda.data,
+                        author=presentation.author
+                    )
+                    ppt_service = PPTGeneratorService()
+                    file_path, filename = ppt_service.generate_presentation(deck, slides_data)
+                    # Create new version record
+                    version = PresentationVersion(
+                        presentation_id=presentation.id,
+                        version_number=new_version_number,
+                        filename=filename,
+                        file_path=file_path,
+                        file_size=os.path.getsize(file_path),
+                        compression_profile=ppt_service.save_profile,
+                        created_by=current_user.id,
+                        change_description='Edited by user',
+                        content_snapshot=json.dumps(slides_data),
+                        slide_hashes=json.dumps(compute_slide_hashes(slides_data)),
+                        content_hash=fingerprint,
+                        idempotency_key=idempotency_key,
+                        preview_html=ppt_service.render_preview(deck, slides_data)
+                    )
+                    db.session.add(version)
+                    # A concurrent edit may already have committed a newer version; if so the
+                    # deck keeps describing that one and this version only joins the history
+                    became_current = presentation.apply_version(
+                        new_version_number,
+                        title=deck.title,
+                        description=deck.description,
+                        agenda=deck.agenda,
+                        content_data=version.content_snapshot,
+                        updated_at=datetime.utcnow()
+                    )
+                    analytics.record_version(presentation)
+                    db.session.commit()
+                submission.result = new_version_number
+                if became_current:
+                    flash('Presentation updated successfully! A new version has been created.', 'success')
+                else:
+                    flash(f'Your changes were saved as version {new_version_number}, but a newer version '
+                          'is already current, so the presentation does not show them.', 'warning')
+                return redirect(url_for('user.view_presentation', id=presentation.id))
         except json.JSONDecodeError:
             flash('Invalid slides data format.', 'error')
+        except AdmissionRejected as e:
+            db.session.rollback()
+            flash('The server is busy generating other presentations. Please try again shortly.', 'warning')
+            return render_template('user/edit.html', form=form, presentation=presentation, slides_list=slides_list), 503, {'Retry-After': str(e.retry_after)}
         except Exception as e:
             db.session.rollback()
             flash(f'Error updating presentation: {str(e)}', 'error')
@@ -213,4 +361,6 @@ def edit_presentation(id):
         form.description.data = presentation.description
         form.agenda.data = presentation.agenda
         form.slides_data.data = presentation.content_data
+    if not form.idempotency_key.data:
+        form.idempotency_key.data = uuid.uuid4().hex
     return render_template('user/edit.html', form=form, presentation=presentation, slides_list=slides_list)
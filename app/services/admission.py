@@ -0,0 +1,196 @@
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+from flask import current_app
+
+try:
+    import fcntl
+except ImportError:  # Windows: the budget is enforced per process only
+    fcntl = None
+
+
+class AdmissionRejected(Exception):
+    """Raised when a generation cannot be admitted within the queue timeout"""
+
+    def __init__(self, retry_after: int):
+        super().__init__('Server is busy generating other presentations.')
+        self.retry_after = retry_after
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class SharedLedger:
+    """Reservations of every worker process, kept in a JSON file under an exclusive lock"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    @contextmanager
+    def _locked(self):
+        with open(self.path, 'a+') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                try:
+                    entries = json.loads(f.read() or '{}')
+                except ValueError:
+                    entries = {}
+                # Drop reservations of workers that exited without releasing them
+                entries = {token: entry for token, entry in entries.items() if _pid_alive(entry['pid'])}
+                yield entries
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(entries))
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def try_reserve(self, token: str, cost: int, budget_bytes: int) -> bool:
+        with self._locked() as entries:
+            in_use = sum(entry['cost'] for entry in entries.values())
+            if entries and in_use + cost > budget_bytes:
+                return False
+            entries[token] = {'pid': os.getpid(), 'cost': cost}
+            return True
+
+    def release(self, token: str):
+        with self._locked() as entries:
+            entries.pop(token, None)
+
+    def totals(self) -> Dict:
+        with self._locked() as entries:
+            return {
+                'in_use_bytes': sum(entry['cost'] for entry in entries.values()),
+                'active': len(entries),
+                'workers': len({entry['pid'] for entry in entries.values()}),
+            }
+
+
+class AdmissionController:
+    """Memory budget shared by all concurrent presentation generations.
+
+    Each generation builds its whole deck in memory, so concurrent large
+    submissions are admitted only while their estimated cost fits in the
+    budget. Requests that do not fit wait up to ``queue_timeout`` seconds
+    and are then rejected. A single request larger than the whole budget
+    is admitted only when nothing else is running.
+
+    With a ``ledger_path`` the budget is shared by every worker process
+    using that file; without one (or where file locks are unavailable) it
+    applies to this process only.
+    """
+
+    # Rough per-generation memory cost model (bytes)
+    BASE_COST = 4 * 1024 * 1024
+    PER_SLIDE_COST = 64 * 1024
+    PER_CHAR_COST = 64
+    PER_IMAGE_COST = 2 * 1024 * 1024
+
+    # How often a waiting request re-checks reservations made by other workers
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, budget_bytes: int, queue_timeout: float, ledger_path: Optional[str] = None):
+        self.budget_bytes = budget_bytes
+        self.queue_timeout = queue_timeout
+        self._ledger = SharedLedger(ledger_path) if ledger_path and fcntl else None
+        self._cond = threading.Condition()
+        self._in_use = 0
+        self._active = 0
+        self._waiting = 0
+        self._admitted = 0
+        self._rejected = 0
+        self._peak_in_use = 0
+
+    @classmethod
+    def estimate_cost(cls, slides_data: List[Dict], *texts) -> int:
+        """Estimate the memory needed to generate a deck from its slide and character counts"""
+        chars = sum(len(t) for t in texts if t)
+        images = 0
+        for slide in slides_data or []:
+            if not isinstance(slide, dict):
+                continue
+            chars += len(str(slide.get('title', ''))) + len(str(slide.get('content', '')))
+            chars += sum(len(str(b)) for b in slide.get('bullet_points', []) or [])
+            if slide.get('image'):
+                images += 1
+        slide_count = len(slides_data or []) + 3  # title, agenda and thank-you slides
+        return (cls.BASE_COST + slide_count * cls.PER_SLIDE_COST
+                + chars * cls.PER_CHAR_COST + images * cls.PER_IMAGE_COST)
+
+    @contextmanager
+    def admit(self, cost: int):
+        """Hold ``cost`` bytes of the budget for the duration of the block"""
+        token = uuid.uuid4().hex
+        self._acquire(token, cost)
+        try:
+            yield
+        finally:
+            self._release(token, cost)
+
+    def usage(self) -> Dict:
+        """Counters for this process; ``all_workers`` covers every process sharing the ledger"""
+        with self._cond:
+            usage = {
+                'scope': 'shared' if self._ledger else 'process',
+                'budget_bytes': self.budget_bytes,
+                'in_use_bytes': self._in_use,
+                'peak_in_use_bytes': self._peak_in_use,
+                'active': self._active,
+                'waiting': self._waiting,
+                'admitted': self._admitted,
+                'rejected': self._rejected,
+            }
+            if self._ledger:
+                usage['all_workers'] = self._ledger.totals()
+            return usage
+
+    def _try_reserve(self, token: str, cost: int) -> bool:
+        if self._ledger:
+            if not self._ledger.try_reserve(token, cost, self.budget_bytes):
+                return False
+        elif self._active and self._in_use + cost > self.budget_bytes:
+            return False
+        self._in_use += cost
+        self._active += 1
+        self._admitted += 1
+        self._peak_in_use = max(self._peak_in_use, self._in_use)
+        return True
+
+    def _acquire(self, token: str, cost: int):
+        deadline = time.monotonic() + self.queue_timeout
+        with self._cond:
+            self._waiting += 1
+            try:
+                while not self._try_reserve(token, cost):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._rejected += 1
+                        raise AdmissionRejected(retry_after=max(1, int(self.queue_timeout)))
+                    # Local releases notify; releases in other workers are picked up by polling
+                    self._cond.wait(min(remaining, self.POLL_INTERVAL) if self._ledger else remaining)
+            finally:
+                self._waiting -= 1
+
+    def _release(self, token: str, cost: int):
+        with self._cond:
+            if self._ledger:
+                self._ledger.release(token)
+            self._in_use -= cost
+            self._active -= 1
+            self._cond.notify_all()
+
+
+def get_admission_controller() -> AdmissionController:
+    return current_app.extensions['admission']
@@ -0,0 +1,221 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models.analytics import ReviewEvent, ReviewRollup
+
+
+def _increment(day: date, department: Optional[str], reviewer_id: int = 0, **counters):
+    """Add to a rollup row's counters within the current transaction, creating it if needed"""
+    key = {'day': day, 'department': department or '', 'reviewer_id': reviewer_id or 0}
+    values = {name: getattr(ReviewRollup, name) + amount for name, amount in counters.items()}
+    updated = ReviewRollup.query.filter_by(**key).update(values, synchronize_session=False)
+    if updated:
+        return
+    try:
+        with db.session.begin_nested():
+            db.session.add(ReviewRollup(**key, **counters))
+    except IntegrityError:
+        # Another request created the row first
+        ReviewRollup.query.filter_by(**key).update(values, synchronize_session=False)
+
+
+def _department_of(presentation) -> str:
+    return presentation.author.department if presentation.author else ''
+
+
+def record_submission(presentation):
+    """Count a new presentation and its first version"""
+    _increment(datetime.utcnow().date(), _department_of(presentation), submissions=1, versions_created=1)
+
+
+def record_version(presentation):
+    _increment(datetime.utcnow().date(), _department_of(presentation), versions_created=1)
+
+
+def _submitted_at(presentation) -> datetime:
+    """When the reviewed content was submitted: the current version's creation time"""
+    version = presentation.get_current_version()
+    if version and version.created_at:
+        return version.created_at
+    return presentation.created_at or datetime.utcnow()
+
+
+def _count_events(events, sign: int = 1):
+    """Add (or with ``sign`` -1, remove) review events' outcomes from the rollups"""
+    grouped = defaultdict(lambda: dict.fromkeys(('approvals', 'rejections', 'turnaround_seconds'), 0))
+    for event in events:
+        counters = grouped[(event.reviewed_at.date(), event.department or '', event.reviewer_id or 0)]
+        counters['approvals' if event.status == 'approved' else 'rejections'] += sign
+        counters['turnaround_seconds'] += sign * event.turnaround_seconds
+    for (day, department, reviewer_id), counters in grouped.items():
+        _increment(day, department, reviewer_id, **counters)
+
+
+def _record_decisions(events):
+    """Count new review events, superseding earlier decisions on the same versions"""
+    reviewed = {(event.presentation_id, event.version_number) for event in events}
+    previous = [
+        event for event in ReviewEvent.query.filter(
+            ReviewEvent.presentation_id.in_({presentation_id for presentation_id, _ in reviewed}),
+            ReviewEvent.superseded.is_(False)
+        )
+        if (event.presentation_id, event.version_number) in reviewed
+    ]
+    if previous:
+        _count_events(previous, sign=-1)
+        ReviewEvent.query.filter(ReviewEvent.id.in_([event.id for event in previous]))\
+            .update({'superseded': True}, synchronize_session=False)
+    db.session.add_all(events)
+    _count_events(events)
+
+
+def _review_event(presentation_id, version_number, department, submitted_at, reviewer_id, status, reviewed_at):
+    return ReviewEvent(
+        presentation_id=presentation_id,
+        version_number=version_number,
+        reviewer_id=reviewer_id or 0,
+        department=department or '',
+        status=status,
+        reviewed_at=reviewed_at,
+        turnaround_seconds=max(0.0, (reviewed_at - (submitted_at or reviewed_at)).total_seconds())
+    )
+
+
+def record_review(presentation, reviewer_id: int, status: str, reviewed_at: Optional[datetime] = None):
+    """Count a review of the presentation's current version, replacing any earlier decision on it"""
+    reviewed_at = reviewed_at or datetime.utcnow()
+    _record_decisions([_review_event(
+        presentation.id, presentation.current_version, _department_of(presentation),
+        _submitted_at(presentation), reviewer_id, status, reviewed_at
+    )])
+
+
+def record_bulk_review(rows, reviewer_id: int, status: str, reviewed_at: datetime):
+    """Record many reviews at once; ``rows`` are (presentation_id, version_number, department, submitted_at)"""
+    _record_decisions([
+        _review_event(presentation_id, version_number, department, submitted_at, reviewer_id, status, reviewed_at)
+        for presentation_id, version_number, department, submitted_at in rows
+    ])
+
+
+def rebuild():
+    """Recompute all rollups from presentations, versions and review events.
+
+    Reviews count from the active (not superseded) review events, the same
+    rule the incremental path applies. Presentations reviewed before events
+    were recorded get an event for their latest review.
+    """
+    from app.models.presentation import Presentation
+    from app.models.user import User
+    from app.models.version import PresentationVersion
+
+    author_departments = dict(db.session.query(User.id, User.department).all())
+    counters = defaultdict(lambda: dict.fromkeys(ReviewRollup.COUNTERS, 0))
+
+    presentations = db.session.query(
+        Presentation.id, Presentation.author_id, Presentation.created_at, Presentation.status,
+        Presentation.reviewed_by, Presentation.reviewed_at, Presentation.current_version
+    ).all()
+    departments = {row.id: author_departments.get(row.author_id) or '' for row in presentations}
+
+    version_times = defaultdict(list)
+    for presentation_id, created_at in db.session.query(
+            PresentationVersion.presentation_id, PresentationVersion.created_at):
+        version_times[presentation_id].append(created_at)
+        counters[(created_at.date(), departments.get(presentation_id, ''), 0)]['versions_created'] += 1
+
+    with_events = {presentation_id for (presentation_id,) in db.session.query(ReviewEvent.presentation_id).distinct()}
+    for row in presentations:
+        counters[(row.created_at.date(), departments[row.id], 0)]['submissions'] += 1
+        if row.id in with_events or row.reviewed_at is None or row.status not in ('approved', 'rejected'):
+            continue
+        submitted_at = max(
+            (t for t in version_times[row.id] if t <= row.reviewed_at), default=row.created_at
+        )
+        db.session.add(_review_event(
+            row.id, row.current_version, departments[row.id], submitted_at,
+            row.reviewed_by, row.status, row.reviewed_at
+        ))
+    db.session.flush()
+
+    for event in ReviewEvent.query.filter(ReviewEvent.superseded.is_(False)):
+        review = counters[(event.reviewed_at.date(), event.department or '', event.reviewer_id or 0)]
+        review['approvals' if event.status == 'approved' else 'rejections'] += 1
+        review['turnaround_seconds'] += event.turnaround_seconds
+
+    ReviewRollup.query.delete()
+    db.session.add_all(
+        ReviewRollup(day=day, department=department, reviewer_id=reviewer_id, **values)
+        for (day, department, reviewer_id), values in counters.items()
+    )
+    db.session.commit()
+    return len(counters)
+
+
+def _rates(totals: Dict) -> Dict:
+    reviews = totals['approvals'] + totals['rejections']
+    return {
+        **totals,
+        'reviews': reviews,
+        'approval_rate': round(totals['approvals'] / reviews, 4) if reviews else None,
+        'avg_turnaround_hours': round(totals['turnaround_seconds'] / reviews / 3600, 2) if reviews else None,
+    }
+
+
+def summarize(days: int = 30) -> Dict:
+    """Turnaround and approval metrics over the last ``days`` days, read from rollups only"""
+    from app.models.user import User
+
+    since = datetime.utcnow().date() - timedelta(days=days - 1)
+    sums = [func.coalesce(func.sum(getattr(ReviewRollup, name)), 0).label(name) for name in ReviewRollup.COUNTERS]
+
+    def totals(row):
+        return {name: getattr(row, name) for name in ReviewRollup.COUNTERS}
+
+    overall = totals(db.session.query(*sums).filter(ReviewRollup.day >= since).one())
+    overall = _rates(overall)
+    overall['versions_per_deck'] = round(overall['versions_created'] / overall['submissions'], 2) \
+        if overall['submissions'] else None
+
+    by_department = []
+    for row in db.session.query(ReviewRollup.department, *sums)\
+            .filter(ReviewRollup.day >= since)\
+            .group_by(ReviewRollup.department)\
+            .order_by(ReviewRollup.department):
+        by_department.append({'department': row.department or 'Unassigned', **_rates(totals(row))})
+
+    by_reviewer = []
+    for row in db.session.query(ReviewRollup.reviewer_id, User.username, *sums)\
+            .outerjoin(User, User.id == ReviewRollup.reviewer_id)\
+            .filter(ReviewRollup.day >= since, ReviewRollup.reviewer_id != 0)\
+            .group_by(ReviewRollup.reviewer_id, User.username)\
+            .order_by(User.username):
+        stats = _rates(totals(row))
+        by_reviewer.append({
+            'reviewer_id': row.reviewer_id,
+            'reviewer': row.username or f'#{row.reviewer_id}',
+            'reviews': stats['reviews'],
+            'approvals': stats['approvals'],
+            'rejections': stats['rejections'],
+            'approval_rate': stats['approval_rate'],
+            'avg_turnaround_hours': stats['avg_turnaround_hours'],
+        })
+
+    daily = []
+    for row in db.session.query(ReviewRollup.day, *sums)\
+            .filter(ReviewRollup.day >= since)\
+            .group_by(ReviewRollup.day)\
+            .order_by(ReviewRollup.day):
+        daily.append({'day': row.day.isoformat(), **_rates(totals(row))})
+
+    return {
+        'since': since.isoformat(),
+        'days': days,
+        'overall': overall,
+        'by_department': by_department,
+        'by_reviewer': by_reviewer,
+        'daily': daily,
+    }
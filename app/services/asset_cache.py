@@ -0,0 +1,86 @@
+from PIL import Image, ImageOps, UnidentifiedImageError
+from io import BytesIO
+import hashlib
+import os
+from typing import Optional, Tuple
+from flask import current_app
+from app.services.storage import atomic_write
+
+
+class AssetError(ValueError):
+    """Raised when an uploaded file cannot be turned into a slide image"""
+
+
+class AssetCache:
+    """Content-addressed store of pre-processed slide images.
+
+    Uploads are decoded once, downscaled to fit the slide box they will be
+    placed in and recompressed. The result is stored under the hash of the
+    original upload, so the same image uploaded twice (or used on several
+    slides and decks) is never decoded or re-encoded again.
+    """
+
+    JPEG_QUALITY = 85
+
+    def __init__(self, storage_dir: Optional[str] = None, max_size: Optional[Tuple[int, int]] = None):
+        self.storage_dir = storage_dir or current_app.config['ASSET_FOLDER']
+        self.max_size = max_size or current_app.config['ASSET_MAX_PIXELS']
+        self.max_source_pixels = current_app.config['ASSET_MAX_SOURCE_PIXELS']
+
+    def store(self, data: bytes) -> str:
+        """Process raw upload bytes and return the asset id (content hash)"""
+        asset_id = hashlib.sha256(data).hexdigest()
+        if self.get_path(asset_id):
+            return asset_id
+
+        try:
+            image = Image.open(BytesIO(data))
+            # Image.open only reads the header, so reject huge images before anything is decoded
+            width, height = image.size
+            if width * height > self.max_source_pixels:
+                raise AssetError(
+                    f'Image is too large ({width}x{height}); the limit is {self.max_source_pixels:,} pixels.'
+                )
+            # Let JPEGs decode at a reduced scale that still covers the target box (in either orientation)
+            side = max(self.max_size)
+            image.draft(image.mode, (side, side))
+            image = ImageOps.exif_transpose(image)
+        except Image.DecompressionBombError as e:
+            raise AssetError('Image is too large.') from e
+        except (UnidentifiedImageError, OSError) as e:
+            raise AssetError('Unsupported or corrupt image file.') from e
+
+        image.thumbnail(self.max_size, Image.LANCZOS)
+
+        has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+        output = BytesIO()
+        if has_alpha:
+            ext = 'png'
+            image.convert('RGBA').save(output, format='PNG', optimize=True)
+        else:
+            ext = 'jpg'
+            image.convert('RGB').save(output, format='JPEG', quality=self.JPEG_QUALITY, optimize=True)
+
+        with atomic_write(self._build_path(asset_id, ext)) as f:
+            f.write(output.getvalue())
+        return asset_id
+
+    def store_file(self, file_path: str) -> Optional[str]:
+        """Store an image from disk, returning None if it does not exist"""
+        if not os.path.exists(file_path):
+            return None
+        with open(file_path, 'rb') as f:
+            return self.store(f.read())
+
+    def get_path(self, asset_id: str) -> Optional[str]:
+        """Return the processed file path for an asset id, if it is stored"""
+        if not asset_id or not all(c in '0123456789abcdef' for c in asset_id) or len(asset_id) != 64:
+            return None
+        for ext in ('jpg', 'png'):
+            path = self._build_path(asset_id, ext)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _build_path(self, asset_id: str, ext: str) -> str:
+        return os.path.join(self.storage_dir, asset_id[:2], f"{asset_id}.{ext}")
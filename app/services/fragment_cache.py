@@ -0,0 +1,112 @@
+import threading
+from collections import OrderedDict
+from itertools import chain
+from typing import Callable, Dict
+from flask import current_app
+from markupsafe import Markup
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+from app import db
+from app.models.cache import DataGeneration
+
+
+def get_data_generation() -> int:
+    return db.session.query(DataGeneration.value).filter_by(id=1).scalar() or 0
+
+
+def bump_data_generation(session=None):
+    """Invalidate cached fragments as part of the current transaction"""
+    (session or db.session).execute(update(DataGeneration).where(DataGeneration.id == 1)
+                                    .values(value=DataGeneration.value + 1))
+
+
+def _tracked_change(session) -> bool:
+    from app.models.presentation import Presentation
+    from app.models.user import User
+    from app.models.version import PresentationVersion
+
+    for obj in chain(session.new, session.deleted):
+        if isinstance(obj, (Presentation, PresentationVersion, User)):
+            return True
+    # Users change on every login (last_login), which no cached page shows
+    return any(isinstance(obj, (Presentation, PresentationVersion)) and session.is_modified(obj)
+               for obj in session.dirty)
+
+
+def _bump_on_flush(session, flush_context):
+    if _tracked_change(session):
+        session.connection().execute(update(DataGeneration).where(DataGeneration.id == 1)
+                                     .values(value=DataGeneration.value + 1))
+
+
+def register_invalidation():
+    """Bump the data generation in any flush that changes cached data, and seed its row"""
+    if not event.contains(Session, 'after_flush', _bump_on_flush):
+        event.listen(Session, 'after_flush', _bump_on_flush)
+    if not db.session.get(DataGeneration, 1):
+        db.session.add(DataGeneration(id=1, value=0))
+        db.session.commit()
+
+
+class FragmentCache:
+    """LRU cache of rendered HTML fragments, capped by total size.
+
+    Keys are combined with the data generation, and entries from an older
+    generation are dropped as soon as a newer one is seen.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._size = 0
+        self._generation = None
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get_or_render(self, key: str, render: Callable[[], str]) -> Markup:
+        generation = get_data_generation()
+        with self._lock:
+            if generation != self._generation:
+                self._entries.clear()
+                self._size = 0
+                self._generation = generation
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return Markup(self._entries[key])
+            self._misses += 1
+
+        html = str(render())
+        size = len(html.encode('utf-8'))
+
+        with self._lock:
+            if generation == self._generation and size <= self.max_bytes:
+                if key in self._entries:
+                    self._size -= len(self._entries.pop(key).encode('utf-8'))
+                self._entries[key] = html
+                self._size += size
+                while self._size > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self._size -= len(evicted.encode('utf-8'))
+                    self._evictions += 1
+        return Markup(html)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'generation': self._generation,
+                'entries': len(self._entries),
+                'size_bytes': self._size,
+                'max_bytes': self.max_bytes,
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'hit_rate': round(self._hits / lookups, 4) if lookups else None,
+            }
+
+
+def get_fragment_cache() -> FragmentCache:
+    return current_app.extensions['fragment_cache']
@@ -0,0 +1,139 @@
+import hashlib
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from flask import current_app
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models.submission import SubmissionClaim
+
+
+def _normalize_text(value) -> str:
+    if value is None:
+        return ''
+    lines = str(value).replace('\r\n', '\n').replace('\r', '\n').split('\n')
+    return '\n'.join(line.rstrip() for line in lines).strip()
+
+
+def normalize_slide(slide) -> Dict:
+    if not isinstance(slide, dict):
+        return {'content': _normalize_text(slide)}
+    normalized = {}
+    for key, value in slide.items():
+        if isinstance(value, list):
+            normalized[key] = [_normalize_text(v) for v in value]
+        else:
+            normalized[key] = _normalize_text(value)
+    return normalized
+
+
+def content_fingerprint(title, description, agenda, slides_data: List) -> str:
+    """Stable hash of everything that ends up in a generated deck.
+
+    Whitespace at line ends, line endings and dict key order are normalized
+    so that re-submitting the same form always yields the same fingerprint.
+    """
+    payload = {
+        'title': _normalize_text(title),
+        'description': _normalize_text(description),
+        'agenda': _normalize_text(agenda),
+        'slides': [normalize_slide(s) for s in (slides_data or [])],
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class _Claim:
+    def __init__(self):
+        self.result = None
+
+
+class InFlightRegistry:
+    """Claims on submissions being generated, shared by every worker process through the database.
+
+    The first submission for a key commits a claim row before generating.
+    A duplicate with the same key, in any worker, polls that row until the
+    owner records its result and then reuses it instead of generating the
+    deck again. If the owner fails, the claim is removed and the duplicate
+    runs its own attempt.
+    """
+
+    POLL_INTERVAL = 0.1
+    RETENTION = timedelta(hours=1)  # Finished claims still answer late duplicates for this long
+
+    def __init__(self, wait_timeout: float):
+        self.wait_timeout = wait_timeout
+
+    @contextmanager
+    def claim(self, key: str, retain: bool = True):
+        """Yield an entry whose ``result`` is set if an identical submission already finished.
+
+        The owner of a claim should store its outcome in ``entry.result`` so
+        that waiting duplicates can reuse it. With ``retain`` the finished
+        claim is kept for ``RETENTION``; pass False for submissions without an
+        idempotency key, so identical content can be submitted again later.
+        """
+        entry = _Claim()
+        owner = self._acquire(key, entry)
+        if entry.result is not None:
+            yield entry
+            return
+        try:
+            yield entry
+        finally:
+            if owner:
+                self._finish(key, entry.result, retain)
+
+    def in_flight(self) -> int:
+        return SubmissionClaim.query.filter(SubmissionClaim.result.is_(None)).count()
+
+    def _acquire(self, key: str, entry: _Claim) -> bool:
+        """Claim ``key``, or wait for its owner; returns True if this request owns the claim"""
+        deadline = time.monotonic() + self.wait_timeout
+        table = SubmissionClaim.__table__
+        while True:
+            if self._insert(key):
+                return True
+            with db.engine.connect() as conn:
+                row = conn.execute(select(table.c.result).where(table.c.key == key)).first()
+            if row is not None and row.result is not None:
+                entry.result = row.result
+                return False
+            if time.monotonic() >= deadline:
+                # The original attempt is taking too long; run our own without a claim
+                return False
+            if row is not None:
+                time.sleep(self.POLL_INTERVAL)
+
+    def _insert(self, key: str) -> bool:
+        # Claims are written on their own connection so they are committed
+        # immediately, independently of the request's session
+        table = SubmissionClaim.__table__
+        now = datetime.utcnow()
+        try:
+            with db.engine.begin() as conn:
+                conn.execute(table.delete().where(table.c.created_at < now - self.RETENTION))
+                conn.execute(table.insert().values(key=key, created_at=now))
+            return True
+        except IntegrityError:
+            return False
+
+    def _finish(self, key: str, result: Optional[int], retain: bool):
+        table = SubmissionClaim.__table__
+        with db.engine.begin() as conn:
+            if result is not None and retain:
+                conn.execute(table.update().where(table.c.key == key).values(result=result))
+            else:
+                conn.execute(table.delete().where(table.c.key == key))
+
+
+def get_inflight_registry() -> InFlightRegistry:
+    return current_app.extensions['inflight']
+
+
+def submission_key(user_id: int, idempotency_key: Optional[str], fingerprint: str) -> str:
+    """In-flight key; the fingerprint is always included so a reused key never shares another payload's result"""
+    return f"{user_id}:{idempotency_key or ''}:{fingerprint}"
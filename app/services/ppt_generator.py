@@ -2,10 +2,12 @@ from pptx import Presentation
 from pptx.util import Inches, Pt
 from pptx.enum.text import PP_ALIGN
 from pptx.dml.color import RGBColor
-import os
 from datetime import datetime
 from typing import Dict, List, Tuple
 from flask import current_app
+from app.services.asset_cache import AssetCache
+from app.services.preview import render_preview
+from app.services.storage import PresentationStorage
 
 class PPTGeneratorService:
     """Service for generating PowerPoint presentations"""
@@ -18,8 +20,21 @@ class PPTGeneratorService:
             'text': RGBColor(64, 64, 64),
             'light': RGBColor(245, 245, 245)
         }
+        self.asset_cache = AssetCache()
+        self.storage = PresentationStorage()
+        self.save_profile = current_app.config['PPT_SAVE_PROFILE']
 
     def generate_presentation(self, presentation_obj, slides_data: List[Dict]) -> Tuple[str, str]:
+        prs = self.build_presentation(presentation_obj, slides_data)
+
+        filename = self._generate_filename(presentation_obj)
+        file_path = self._get_file_path(presentation_obj.id, filename)
+
+        self.storage.save_presentation(prs, file_path, self.save_profile)
+        return file_path, filename
+
+    def build_presentation(self, presentation_obj, slides_data: List[Dict]) -> Presentation:
+        """Build the deck in memory without saving it"""
         prs = Presentation()
         prs.slide_width = Inches(13.33)
         prs.slide_height = Inches(7.5)
@@ -45,14 +60,11 @@ class PPTGeneratorService:
                 self._create_content_slide(prs, slide_data)
 
         self._create_thank_you_slide(prs)
+        return prs
 
-        filename = self._generate_filename(presentation_obj)
-        file_path = self._get_file_path(presentation_obj.id, filename)
-
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        prs.save(file_path)
-        abs_file_path = os.path.abspath(file_path)  # Ensure absolute path is stored
-        return abs_file_path, filename
+    def render_preview(self, presentation_obj, slides_data: List[Dict], generated_at=None) -> str:
+        """HTML preview of the deck build_presentation would produce, for display without downloading"""
+        return render_preview(presentation_obj, slides_data, self.company_colors, generated_at)
 
     def _create_title_slide(self, prs, presentation_obj):
         slide = prs.slides.add_slide(prs.slide_layouts[6])
@@ -79,6 +91,10 @@ class PPTGeneratorService:
         subtitle_frame.paragraphs[0].font.color.rgb = self.company_colors['text']
         subtitle_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
 
+        logo_id = self.asset_cache.store_file(current_app.config['ORGANIZATION_LOGO'])
+        if logo_id:
+            slide.shapes.add_picture(self.asset_cache.get_path(logo_id), Inches(11.33), Inches(0.5), height=Inches(1))
+
     def _create_agenda_slide(self, prs, agenda_text: str):
         slide = prs.slides.add_slide(prs.slide_layouts[1])
         slide.shapes.title.text = "Agenda"
@@ -106,8 +122,14 @@ class PPTGeneratorService:
         content_text = slide_data.get('content', '')
         bullet_points = slide_data.get('bullet_points', [])
 
+        image_path = self.asset_cache.get_path(slide_data.get('image'))
+        if image_path:
+            self._add_slide_image(slide, image_path)
+
         if content_text or bullet_points:
             content = slide.placeholders[1]
+            if image_path:
+                content.width = Inches(6.5)
             text_frame = content.text_frame
             text_frame.clear()
 
@@ -125,6 +147,17 @@ class PPTGeneratorService:
                 p.font.color.rgb = self.company_colors['text']
                 p.space_after = Pt(6)
 
+    def _add_slide_image(self, slide, image_path: str):
+        """Place a pre-processed asset inside the right-hand image box, keeping its aspect ratio"""
+        box_left, box_top = Inches(7.33), Inches(1.75)
+        box_width, box_height = Inches(5.5), Inches(5)
+        picture = slide.shapes.add_picture(image_path, box_left, box_top)
+        scale = min(box_width / picture.width, box_height / picture.height)
+        picture.width = int(picture.width * scale)
+        picture.height = int(picture.height * scale)
+        picture.left = box_left + (box_width - picture.width) // 2
+        picture.top = box_top + (box_height - picture.height) // 2
+
     def _create_thank_you_slide(self, prs):
         slide = prs.slides.add_slide(prs.slide_layouts[6])
         slide.background.fill.solid()
@@ -145,6 +178,4 @@ class PPTGeneratorService:
         return f"{safe_title}_{timestamp}.pptx"
 
     def _get_file_path(self, presentation_id: int, filename: str) -> str:
-        storage_dir = current_app.config['UPLOAD_FOLDER']
-        presentation_dir = os.path.join(storage_dir, str(presentation_id))
-        return os.path.join(presentation_dir, filename)
+        return self.storage.get_file_path(presentation_id, filename)
@@ -0,0 +1,83 @@
+import hashlib
+import json
+from datetime import datetime
+from typing import Dict, List, Optional
+from flask import current_app, render_template, url_for
+from sqlalchemy.orm.attributes import set_committed_value
+from app import db
+from app.services.asset_cache import AssetCache
+
+
+def _agenda_items(agenda) -> List[str]:
+    """Agenda lines, parsed the same way as PPTGeneratorService.build_presentation"""
+    if not agenda:
+        return []
+    try:
+        parsed = json.loads(agenda)
+        agenda_text = "\n".join(parsed) if isinstance(parsed, list) else str(parsed)
+    except (ValueError, TypeError):
+        agenda_text = str(agenda)
+    return [line.strip() for line in agenda_text.split("\n") if line.strip()]
+
+
+def _content_lines(slide_data: Dict) -> List[str]:
+    lines = [line.strip() for line in (slide_data.get('content') or '').split("\n") if line.strip()]
+    lines.extend(slide_data.get('bullet_points') or [])
+    return lines
+
+
+def render_preview(presentation_obj, slides_data: List[Dict], colors: Dict,
+                   generated_at: Optional[datetime] = None) -> str:
+    """Render an HTML fragment with one block per slide, mirroring the generated deck's layouts"""
+    asset_cache = AssetCache()
+    logo_id = asset_cache.store_file(current_app.config['ORGANIZATION_LOGO'])
+
+    slides = []
+    for slide_data in slides_data or []:
+        if not isinstance(slide_data, dict):
+            slide_data = {'content': str(slide_data)}
+        image_id = slide_data.get('image')
+        slides.append({
+            'title': slide_data.get('title', 'Slide Title'),
+            'lines': _content_lines(slide_data),
+            'image_url': url_for('user.view_asset', asset_id=image_id) if asset_cache.get_path(image_id) else None,
+        })
+
+    author = presentation_obj.author
+    return render_template(
+        'previews/deck.html',
+        title=presentation_obj.title,
+        author=author.username,
+        department=author.department,
+        date=(generated_at or datetime.now()).strftime('%B %d, %Y'),
+        logo_url=url_for('user.view_asset', asset_id=logo_id) if logo_id else None,
+        agenda=_agenda_items(presentation_obj.agenda),
+        slides=slides,
+        colors={name: f'#{color}' for name, color in colors.items()},
+    )
+
+
+def preview_etag(version) -> str:
+    """Versions never change once written, so their identity is enough"""
+    return hashlib.sha1(f'preview:{version.id}:{version.created_at}'.encode('utf-8')).hexdigest()
+
+
+def get_preview(version) -> str:
+    """Stored preview for a version, rendering and saving it for versions created before previews existed.
+
+    Backfilled previews use the presentation's current title and agenda, since
+    only slides are kept in version snapshots.
+    """
+    if version.preview_html:
+        return version.preview_html
+    from app.services.ppt_generator import PPTGeneratorService
+    html = PPTGeneratorService().render_preview(
+        version.presentation, version.get_slides(), generated_at=version.created_at
+    )
+    # A Core UPDATE outside the flush, so the fragment cache's change tracking does
+    # not treat a cached rendering as a data change and invalidate every page
+    table = version.__table__
+    db.session.execute(table.update().where(table.c.id == version.id).values(preview_html=html))
+    db.session.commit()
+    set_committed_value(version, 'preview_html', html)
+    return html
@@ -0,0 +1,152 @@
+import hashlib
+import os
+import stat
+import tempfile
+import zipfile
+from contextlib import contextmanager
+from typing import Optional
+from flask import current_app
+from pptx.opc.serialized import PackageWriter, _ZipPkgWriter
+from pptx.util import lazyproperty
+
+# Zip settings per save profile: (compression method, deflate level)
+COMPRESSION_PROFILES = {
+    'store': (zipfile.ZIP_STORED, None),     # No compression, fastest save, largest files
+    'fast': (zipfile.ZIP_DEFLATED, 1),       # Minimal latency on the request path
+    'default': (zipfile.ZIP_DEFLATED, 6),    # python-pptx's own behaviour
+    'archive': (zipfile.ZIP_DEFLATED, 9),    # Smallest files, used for background recompression
+}
+
+
+def _default_file_mode() -> int:
+    # The umask can only be read by setting it, so do that once at import rather than per write
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+DEFAULT_FILE_MODE = _default_file_mode()
+
+
+@contextmanager
+def atomic_write(path: str):
+    """Write a file through a temp file in the same directory, then fsync and rename.
+
+    Readers never see a partially written file: either the previous file
+    (if any) or the complete new one is at ``path``. The file gets the
+    replaced file's permissions, or those of a normally created file
+    (mkstemp's private 0600 would otherwise survive the rename).
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            mode = DEFAULT_FILE_MODE
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    _fsync_directory(directory)
+
+
+def _fsync_directory(directory: str):
+    # Persist the rename itself; not supported on every platform
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class _ProfileZipPkgWriter(_ZipPkgWriter):
+    def __init__(self, pkg_file, compression, level):
+        super().__init__(pkg_file)
+        self._compression = compression
+        self._level = level
+
+    @lazyproperty
+    def _zipf(self):
+        return zipfile.ZipFile(self._pkg_file, 'w', compression=self._compression, compresslevel=self._level)
+
+
+class _ProfilePackageWriter(PackageWriter):
+    """python-pptx's package writer with a configurable zip compression level"""
+
+    def __init__(self, pkg_file, pkg_rels, parts, compression, level):
+        super().__init__(pkg_file, pkg_rels, parts)
+        self._compression = compression
+        self._level = level
+
+    def _write(self):
+        with _ProfileZipPkgWriter(self._pkg_file, self._compression, self._level) as phys_writer:
+            self._write_content_types_stream(phys_writer)
+            self._write_pkg_rels(phys_writer)
+            self._write_parts(phys_writer)
+
+
+class PresentationStorage:
+    """File layout for generated presentations.
+
+    Files live in ``<root>/<aa>/<bb>/<presentation_id>/<filename>`` where
+    ``aabb`` are the first hex digits of a hash of the presentation id, so
+    no single directory grows with the total number of decks.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or current_app.config['UPLOAD_FOLDER']
+
+    def get_directory(self, presentation_id: int) -> str:
+        digest = hashlib.md5(str(presentation_id).encode('utf-8')).hexdigest()
+        return os.path.join(self.root, digest[:2], digest[2:4], str(presentation_id))
+
+    def get_file_path(self, presentation_id: int, filename: str) -> str:
+        return os.path.abspath(os.path.join(self.get_directory(presentation_id), filename))
+
+    def save_presentation(self, prs, file_path: str, profile: str = 'default'):
+        """Save a python-pptx Presentation atomically using a compression profile"""
+        compression, level = COMPRESSION_PROFILES[profile]
+        package = prs.part.package
+        with atomic_write(file_path) as f:
+            _ProfilePackageWriter(f, package._rels, tuple(package.iter_parts()), compression, level)._write()
+
+    def recompress(self, file_path: str, profile: str = 'archive') -> int:
+        """Rewrite an existing .pptx with another compression profile; returns the new size"""
+        compression, level = COMPRESSION_PROFILES[profile]
+        with zipfile.ZipFile(file_path, 'r') as source, atomic_write(file_path) as f:
+            with zipfile.ZipFile(f, 'w', compression=compression, compresslevel=level) as target:
+                # Keep member order; [Content_Types].xml must stay first
+                for info in source.infolist():
+                    target.writestr(info.filename, source.read(info))
+        return os.path.getsize(file_path)
+
+    def move_to_layout(self, version) -> Optional[str]:
+        """Move a version's file into the sharded layout; returns the new path if it moved"""
+        target = self.get_file_path(version.presentation_id, os.path.basename(version.file_path))
+        if os.path.abspath(version.file_path) == target:
+            return None
+        if not os.path.exists(version.file_path):
+            # Already moved by an earlier run whose batch was not committed
+            return target if os.path.exists(target) else None
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(version.file_path, target)
+        _fsync_directory(os.path.dirname(target))
+        old_directory = os.path.dirname(version.file_path)
+        try:
+            os.rmdir(old_directory)  # Only succeeds once the old directory is empty
+        except OSError:
+            pass
+        return target
@@ -0,0 +1,132 @@
+import difflib
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, List
+from flask import current_app
+from app.services.idempotency import normalize_slide
+
+
+def compute_slide_hashes(slides_data: List) -> List[str]:
+    """Hash each slide's normalized content, in slide order"""
+    hashes = []
+    for slide in slides_data or []:
+        encoded = json.dumps(normalize_slide(slide), sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+        hashes.append(hashlib.sha256(encoded.encode('utf-8')).hexdigest())
+    return hashes
+
+
+def _slide_lines(slide, field) -> List[str]:
+    value = slide.get(field, '') if isinstance(slide, dict) else (slide if field == 'content' else '')
+    if isinstance(value, list):
+        return [str(v) for v in value]
+    return str(value or '').splitlines()
+
+
+def _text_changes(old_slide, new_slide) -> List[Dict]:
+    """Line-level changes between two versions of one slide, per field"""
+    fields = []
+    for slide in (old_slide, new_slide):
+        if isinstance(slide, dict):
+            fields.extend(k for k in slide if k not in fields)
+    if 'content' not in fields:
+        fields.append('content')
+
+    changes = []
+    for field in fields:
+        old_lines = _slide_lines(old_slide, field)
+        new_lines = _slide_lines(new_slide, field)
+        if old_lines == new_lines:
+            continue
+        matcher = difflib.SequenceMatcher(a=old_lines, b=new_lines, autojunk=False)
+        for op, i1, i2, j1, j2 in matcher.get_opcodes():
+            if op != 'equal':
+                changes.append({
+                    'field': field,
+                    'op': op,
+                    'removed': old_lines[i1:i2],
+                    'added': new_lines[j1:j2]
+                })
+    return changes
+
+
+def diff_versions(old_version, new_version) -> Dict:
+    """Slide-level diff between two versions, driven by their stored slide hashes.
+
+    Unchanged slides are matched by hash alone; snapshots are only parsed
+    when at least one slide was modified, and text diffs are only computed
+    for the modified slides.
+    """
+    old_hashes = old_version.get_slide_hashes()
+    new_hashes = new_version.get_slide_hashes()
+
+    added, removed, modified = [], [], []
+    unchanged = 0
+    matcher = difflib.SequenceMatcher(a=old_hashes, b=new_hashes, autojunk=False)
+    for op, i1, i2, j1, j2 in matcher.get_opcodes():
+        if op == 'equal':
+            unchanged += i2 - i1
+            continue
+        # Pair replaced slides by position; any surplus is an add or remove
+        paired = min(i2 - i1, j2 - j1) if op == 'replace' else 0
+        modified.extend((i1 + k, j1 + k) for k in range(paired))
+        removed.extend(range(i1 + paired, i2))
+        added.extend(range(j1 + paired, j2))
+
+    old_slides = new_slides = None
+    if modified or added or removed:
+        old_slides = old_version.get_slides()
+        new_slides = new_version.get_slides()
+
+    return {
+        'old_version': old_version.version_number,
+        'new_version': new_version.version_number,
+        'unchanged': unchanged,
+        'added': [
+            {'number': j + 1, 'title': new_slides[j].get('title', '') if isinstance(new_slides[j], dict) else ''}
+            for j in added
+        ],
+        'removed': [
+            {'number': i + 1, 'title': old_slides[i].get('title', '') if isinstance(old_slides[i], dict) else ''}
+            for i in removed
+        ],
+        'modified': [
+            {
+                'old_number': i + 1,
+                'new_number': j + 1,
+                'title': new_slides[j].get('title', '') if isinstance(new_slides[j], dict) else '',
+                'changes': _text_changes(old_slides[i], new_slides[j])
+            }
+            for i, j in modified
+        ]
+    }
+
+
+class VersionDiffCache:
+    """LRU memo of computed diffs; versions are immutable so entries never go stale"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get_diff(self, old_version, new_version) -> Dict:
+        key = (old_version.id, new_version.id)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        diff = diff_versions(old_version, new_version)
+
+        with self._lock:
+            self._entries[key] = diff
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return diff
+
+
+def get_version_diff_cache() -> VersionDiffCache:
+    return current_app.extensions['version_diffs']
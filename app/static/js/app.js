@@ -66,6 +66,11 @@ class SlideBuilder {
                             Tip: Use • or - for bullet points, and indent with spaces for sub-bullets
                         </small>
                     </div>
+                    <div class="form-group">
+                        <label class="form-label">Slide Image (optional)</label>
+                        <input type="file" class="form-control slide-image" accept="image/*" 
+                               data-slide="${slideId}">
+                    </div>
                 </div>
             </div>
         `;
@@ -75,9 +80,37 @@ class SlideBuilder {
         const slideElement = document.getElementById(slideId);
         const titleInput = slideElement.querySelector('.slide-title');
         const contentTextarea = slideElement.querySelector('.slide-content-text');
+        const imageInput = slideElement.querySelector('.slide-image');
         
         titleInput.addEventListener('input', () => this.updateSlideData(slideId));
         contentTextarea.addEventListener('input', () => this.updateSlideData(slideId));
+        imageInput.addEventListener('change', () => this.uploadSlideImage(slideId, imageInput));
+    }
+
+    uploadSlideImage(slideId, imageInput) {
+        const slide = this.slides.find(s => s.id === slideId);
+        if (!slide) return;
+
+        if (!imageInput.files.length) {
+            delete slide.image;
+            this.updateSlidesData();
+            return;
+        }
+
+        const formData = new FormData();
+        formData.append('image', imageInput.files[0]);
+        fetch('/user/assets', { method: 'POST', body: formData })
+            .then(response => response.json().then(data => ({ ok: response.ok, data })))
+            .then(({ ok, data }) => {
+                if (!ok) {
+                    imageInput.value = '';
+                    showAlert(data.error || 'Image upload failed.', 'error');
+                    return;
+                }
+                slide.image = data.asset_id;
+                this.updateSlidesData();
+            })
+            .catch(() => showAlert('Image upload failed.', 'error'));
     }
 
     removeSlide(slideId) {
@@ -124,10 +157,13 @@ class SlideBuilder {
     updateSlidesData() {
         const slidesDataField = document.getElementById('slides_data');
         if (slidesDataField) {
-            const slidesData = this.slides.map(slide => ({
-                title: slide.title,
-                content: slide.content
-            }));
+            const slidesData = this.slides.map(slide => {
+                const data = { title: slide.title, content: slide.content };
+                if (slide.image) {
+                    data.image = slide.image;
+                }
+                return data;
+            });
             slidesDataField.value = JSON.stringify(slidesData);
         }
     }
@@ -216,6 +252,23 @@ function confirmAction(message, callback) {
     }
 }
 
+// Slide previews are served with ETags, so repeat views are answered from the browser cache
+function loadSlidePreview(container) {
+    fetch(container.dataset.previewUrl, { credentials: 'same-origin' })
+        .then(response => {
+            if (!response.ok) {
+                throw new Error(response.statusText);
+            }
+            return response.text();
+        })
+        .then(html => {
+            container.innerHTML = html;
+        })
+        .catch(() => {
+            container.innerHTML = '<p class="text-muted">Slide preview is not available.</p>';
+        });
+}
+
 // Form validation helpers
 function validateEmail(email) {
     const re = /^[^\s@]+@[^\s@]+\.[^\s@]+$/;
@@ -229,6 +282,9 @@ document.addEventListener('DOMContentLoaded', function() {
         window.slideBuilder = new SlideBuilder();
     }
     
+    // Load cached slide previews
+    document.querySelectorAll('[data-preview-url]').forEach(loadSlidePreview);
+    
     // Auto-hide alerts after 5 seconds
     const alerts = document.querySelectorAll('.alert');
     alerts.forEach(alert => {
@@ -1,5 +1,5 @@
 from flask_wtf import FlaskForm
-from wtforms import StringField, PasswordField, BooleanField, SubmitField, TextAreaField, SelectField, FieldList, FormField
+from wtforms import StringField, PasswordField, BooleanField, SubmitField, TextAreaField, SelectField, FieldList, FormField, HiddenField
 from wtforms.validators import DataRequired, Email, EqualTo, Length, ValidationError
 from app.models.user import User
 
@@ -36,6 +36,14 @@ class ReviewForm(FlaskForm):
         if user is not None:
             raise ValidationError('Please use a different email address.')
 
+class BulkReviewForm(FlaskForm):
+    status = SelectField('Action', choices=[
+        ('approved', 'Approve selected'),
+        ('rejected', 'Reject selected')
+    ], validators=[DataRequired()])
+    feedback = TextAreaField('Feedback', validators=[Length(max=500)])
+    submit = SubmitField('Apply to Selected')
+
 class SlideContentForm(FlaskForm):
     title = StringField('Slide Title', validators=[DataRequired(), Length(max=200)])
     content = TextAreaField('Slide Content', validators=[DataRequired()])
@@ -48,6 +56,9 @@ class PresentationForm(FlaskForm):
     # Dynamic slide content fields will be added via JavaScript
     slides_data = TextAreaField('Slides Data (JSON)', validators=[DataRequired()])
     
+    # Identifies one submission so that retries and double clicks are not generated twice
+    idempotency_key = HiddenField()
+    
     submit = SubmitField('Generate Presentation')
 
 class AdminReviewForm(FlaskForm):
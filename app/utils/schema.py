@@ -0,0 +1,23 @@
+from sqlalchemy import inspect, text
+
+
+def add_missing_columns(db):
+    """Add model columns that are missing from existing tables.
+
+    ``db.create_all()`` only creates new tables, so columns added to a model
+    after its table was created are added here (always as nullable columns).
+    """
+    inspector = inspect(db.engine)
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column['name'] for column in inspector.get_columns(table.name)}
+        missing = [column for column in table.columns if column.name not in existing]
+        if not missing:
+            continue
+        with db.engine.begin() as conn:
+            for column in missing:
+                column_type = column.type.compile(dialect=db.engine.dialect)
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
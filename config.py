@@ -20,7 +20,22 @@ class Config:
     TEMPLATE_FOLDER = 'templates/ppt'
     ORGANIZATION_LOGO = 'static/images/org_logo.png'
     DEFAULT_THEME = 'corporate'
+    PPT_SAVE_PROFILE = os.environ.get('PPT_SAVE_PROFILE') or 'fast'  # store, fast, default or archive
+    ARCHIVE_AFTER_DAYS = 7  # Versions older than this are recompressed with the archive profile
+
+    # Slide image assets (pre-resized, stored by content hash)
+    ASSET_FOLDER = os.environ.get('ASSET_FOLDER') or 'storage/assets'
+    ASSET_MAX_PIXELS = (1100, 1000)  # Fits the 5.5" x 5" image box at 200 DPI
+    ASSET_MAX_SOURCE_PIXELS = int(os.environ.get('ASSET_MAX_SOURCE_PIXELS') or 25_000_000)  # Larger uploads are rejected undecoded
+
+    # Generation admission control (one budget shared by all worker processes through the ledger file)
+    GENERATION_MEMORY_BUDGET = int(os.environ.get('GENERATION_MEMORY_BUDGET') or 256 * 1024 * 1024)
+    GENERATION_LEDGER = os.environ.get('GENERATION_LEDGER') or 'storage/admission.json'
+    GENERATION_QUEUE_TIMEOUT = float(os.environ.get('GENERATION_QUEUE_TIMEOUT') or 10)
+    DUPLICATE_SUBMISSION_WAIT = 30  # Seconds a duplicate submission waits for the original to finish
     
     # Application Settings
     PRESENTATIONS_PER_PAGE = 10
-    MAX_VERSIONS_DISPLAY = 5
\ No newline at end of file
+    MAX_VERSIONS_DISPLAY = 5
+    VERSION_DIFF_CACHE_SIZE = 256  # Memoized version diffs per worker
+    FRAGMENT_CACHE_MAX_BYTES = 8 * 1024 * 1024  # Rendered dashboard/listing fragments per worker
\ No newline at end of file
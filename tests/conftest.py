@@ -0,0 +1,46 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app, db  # noqa: E402
+from config import Config  # noqa: E402
+
+
+@pytest.fixture
+def app(tmp_path):
+    class TestConfig(Config):
+        TESTING = True
+        WTF_CSRF_ENABLED = False
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'test.db'}"
+        UPLOAD_FOLDER = str(tmp_path / 'ppts')
+        ASSET_FOLDER = str(tmp_path / 'assets')
+        GENERATION_LEDGER = str(tmp_path / 'admission.json')
+
+    app = create_app(TestConfig)
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+def login(client, email, password='secret1'):
+    return client.post('/login', data={'email': email, 'password': password})
+
+
+@pytest.fixture
+def author(app):
+    """A registered user with one presentation (id 1)"""
+    client = app.test_client()
+    client.post('/register', data={
+        'username': 'author', 'email': 'author@example.com', 'department': 'Eng',
+        'password': 'secret1', 'password2': 'secret1',
+    })
+    login(client, 'author@example.com')
+    client.post('/user/create', data={
+        'title': 'Deck', 'description': 'Initial', 'agenda': 'One',
+        'slides_data': '[{"title": "Intro", "content": "initial"}]',
+    })
+    return 'author@example.com'
@@ -0,0 +1,39 @@
+from app.models.presentation import Presentation
+from app.models.user import User
+from app.services import analytics
+from conftest import login
+
+
+def _summary(app):
+    with app.app_context():
+        return analytics.summarize(days=7)
+
+
+def test_replaced_review_decisions_match_rebuild(app, author):
+    client = app.test_client()
+    with app.app_context():
+        admin = User.query.filter_by(email='admin@company.com').one()
+
+        # Approve, then bulk-reject the same version: only the latest decision counts
+        Presentation.query.filter_by(id=1).one().approve(admin)
+        Presentation.bulk_review([1], 'rejected', admin)
+
+    overall = _summary(app)['overall']
+    assert (overall['reviews'], overall['approvals'], overall['rejections']) == (1, 0, 1)
+
+    # A new version is a new submission, so its review counts alongside the earlier one
+    login(client, author)
+    client.post('/user/presentation/1/edit', data={
+        'title': 'Deck', 'description': 'Initial', 'agenda': 'One',
+        'slides_data': '[{"title": "Intro", "content": "revised"}]',
+    })
+    reviewer = app.test_client()
+    login(reviewer, 'admin@company.com', 'admin123')
+    reviewer.post('/admin/presentation/1/review', data={'status': 'approved', 'feedback': 'Looks good'})
+
+    incremental = _summary(app)
+    assert (incremental['overall']['reviews'], incremental['overall']['approvals']) == (2, 1)
+
+    with app.app_context():
+        analytics.rebuild()
+    assert _summary(app) == incremental
@@ -0,0 +1,32 @@
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from app.services.asset_cache import AssetCache, AssetError
+
+
+def _png(size, mode='RGB'):
+    output = BytesIO()
+    Image.new(mode, size).save(output, format='PNG')
+    return output.getvalue()
+
+
+def test_oversized_images_are_rejected(app):
+    with app.test_request_context():
+        cache = AssetCache()
+        # Over Pillow's decompression bomb limit
+        with pytest.raises(AssetError):
+            cache.store(_png((20000, 20000), mode='1'))
+        # Under Pillow's limit but over the configured one
+        with pytest.raises(AssetError):
+            cache.store(_png((6000, 5000), mode='1'))
+
+
+def test_large_jpeg_is_downscaled(app):
+    output = BytesIO()
+    Image.new('RGB', (4000, 3000), 'red').save(output, format='JPEG')
+    with app.test_request_context():
+        cache = AssetCache()
+        with Image.open(cache.get_path(cache.store(output.getvalue()))) as stored:
+            assert stored.size[0] <= 1100 and stored.size[1] <= 1000
@@ -0,0 +1,67 @@
+import json
+import os
+import threading
+import time
+
+from app.models.presentation import Presentation
+from app.services.ppt_generator import PPTGeneratorService
+from conftest import login
+
+EDITORS = 8
+
+
+def test_concurrent_edits_keep_deck_consistent(app, author, monkeypatch):
+    # Earlier editors generate slowest, so older versions finish after newer ones
+    original = PPTGeneratorService.generate_presentation
+    calls = []
+    calls_lock = threading.Lock()
+
+    def slow_generate(self, presentation_obj, slides_data):
+        with calls_lock:
+            order = len(calls)
+            calls.append(order)
+        time.sleep(0.1 * (EDITORS - order))
+        return original(self, presentation_obj, slides_data)
+
+    monkeypatch.setattr(PPTGeneratorService, 'generate_presentation', slow_generate)
+
+    statuses = []
+    superseded = []
+
+    def edit(i):
+        client = app.test_client()
+        login(client, author)
+        response = client.post('/user/presentation/1/edit', data={
+            'title': f'Deck v{i}', 'description': f'Edit {i}', 'agenda': 'One',
+            'slides_data': json.dumps([{'title': 'Intro', 'content': f'edit {i}'}]),
+        })
+        statuses.append(response.status_code)
+        with client.session_transaction() as session:
+            messages = [message for _, message in session.get('_flashes', [])]
+        superseded.append(any('newer version is already current' in m for m in messages))
+
+    threads = [threading.Thread(target=edit, args=(i,)) for i in range(EDITORS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert statuses == [302] * EDITORS
+    # Older editors finish last, so some of them are told their version is not current
+    assert any(superseded) and not all(superseded)
+    with app.app_context():
+        presentation = Presentation.query_with_content().filter_by(id=1).one()
+        versions = presentation.versions.all()
+        numbers = [v.version_number for v in versions]
+
+        # Distinct numbers and no lost generations
+        assert len(numbers) == len(set(numbers)) == EDITORS + 1
+        assert all(os.path.exists(v.file_path) for v in versions)
+
+        # The deck describes exactly its current version
+        assert presentation.current_version == max(numbers)
+        current = presentation.get_current_version()
+        assert presentation.content_data == current.content_snapshot
+        editor = json.loads(current.content_snapshot)[0]['content'].split()[-1]
+        assert presentation.title == f'Deck v{editor}'
+        assert presentation.description == f'Edit {editor}'
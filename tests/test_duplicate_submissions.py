@@ -0,0 +1,42 @@
+import threading
+import time
+
+from app import create_app
+from app.models.presentation import Presentation
+from app.services.ppt_generator import PPTGeneratorService
+from conftest import login
+
+
+def test_duplicate_submission_across_workers_generates_once(app, author, monkeypatch):
+    # A second app on the same database stands in for another worker process
+    other_worker = create_app(type('OtherWorkerConfig', (), dict(app.config)))
+
+    original = PPTGeneratorService.generate_presentation
+
+    def slow_generate(self, presentation_obj, slides_data):
+        time.sleep(0.5)
+        return original(self, presentation_obj, slides_data)
+
+    monkeypatch.setattr(PPTGeneratorService, 'generate_presentation', slow_generate)
+
+    locations = []
+
+    def submit(worker):
+        client = worker.test_client()
+        login(client, author)
+        response = client.post('/user/create', data={
+            'title': 'Double click', 'description': '', 'agenda': 'One',
+            'slides_data': '[{"title": "Intro", "content": "same"}]', 'idempotency_key': 'same',
+        })
+        locations.append(response.headers.get('Location'))
+
+    threads = [threading.Thread(target=submit, args=(worker,)) for worker in (app, other_worker)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with app.app_context():
+        decks = Presentation.query.filter_by(title='Double click').all()
+    assert len(decks) == 1
+    assert locations == [f'/user/presentation/{decks[0].id}'] * 2
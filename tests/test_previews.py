@@ -0,0 +1,49 @@
+from sqlalchemy import event
+from app import db
+from app.models.version import PresentationVersion
+from app.services.fragment_cache import get_data_generation
+from conftest import login
+
+
+def test_preview_backfill_keeps_cached_pages(app, author):
+    with app.app_context():
+        version = PresentationVersion.query.filter_by(presentation_id=1, version_number=1).one()
+        version.preview_html = None
+        db.session.commit()
+        generation = get_data_generation()
+
+    client = app.test_client()
+    login(client, author)
+    response = client.get('/user/presentation/1/preview/1')
+    assert response.status_code == 200
+    assert 'Thank You' in response.get_data(as_text=True)
+
+    with app.app_context():
+        # The backfilled preview is stored without invalidating cached fragments or list ETags
+        assert get_data_generation() == generation
+        version = PresentationVersion.query.filter_by(presentation_id=1, version_number=1).one()
+        assert version.preview_html == response.get_data(as_text=True)
+
+    cached = client.get('/user/presentation/1/preview/1', headers={'If-None-Match': response.headers['ETag']})
+    assert cached.status_code == 304
+
+
+def test_view_page_does_not_load_slide_content(app, author):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    client = app.test_client()
+    login(client, author)
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        response = client.get('/user/presentation/1')
+    finally:
+        with app.app_context():
+            event.remove(db.engine, 'before_cursor_execute', record)
+    assert response.status_code == 200
+    presentation_queries = [s for s in statements if 'FROM presentation' in s and 'presentation.agenda' in s]
+    assert presentation_queries
+    assert not any('presentation.content_data' in s for s in statements)
@@ -0,0 +1,27 @@
+import os
+import stat
+
+from app.services.storage import DEFAULT_FILE_MODE, atomic_write
+
+
+def _mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_atomic_write_uses_normal_file_permissions(tmp_path):
+    path = str(tmp_path / 'new.pptx')
+    with atomic_write(path) as f:
+        f.write(b'data')
+    assert _mode(path) == DEFAULT_FILE_MODE
+
+
+def test_atomic_write_keeps_replaced_file_permissions(tmp_path):
+    path = str(tmp_path / 'existing.pptx')
+    with open(path, 'wb') as f:
+        f.write(b'old')
+    os.chmod(path, 0o640)
+    with atomic_write(path) as f:
+        f.write(b'new')
+    assert _mode(path) == 0o640
+    with open(path, 'rb') as f:
+        assert f.read() == b'new'
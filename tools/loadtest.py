@@ -0,0 +1,606 @@
+"""Load generator simulating concurrent submitters and reviewers.
+
+Starts a local instance on a freshly seeded SQLite database (or targets an
+already running one with --url), drives scripted user and admin scenarios
+and prints a capacity report: throughput, per-endpoint p50/p95/p99 latency,
+error rates (including "database is locked") and server RSS over time.
+
+An optional burst (--burst N) submits N oversized decks at once to check
+admission control: excess submissions must be answered with 503 and
+Retry-After, and --max-rss-growth fails the run if server RSS grows more
+than that during the burst.
+
+Examples:
+    python tools/loadtest.py --server run --users 20 --admins 2 --duration 60
+    python tools/loadtest.py --server gunicorn --workers 4 --users 40 --duration 120
+    python tools/loadtest.py --server gunicorn --workers 4 --burst 20 --burst-slides 400 --max-rss-growth 300
+    python tools/loadtest.py --url http://127.0.0.1:5000 --pid 12345
+
+Only the standard library is needed; gunicorn must be installed for
+--server gunicorn.
+"""
+import argparse
+import http.cookiejar
+import json
+import os
+import random
+import re
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+ADMIN_EMAIL = 'admin@company.com'
+ADMIN_PASSWORD = 'admin123'
+USER_PASSWORD = 'loadtest1'
+
+CSRF_RE = re.compile(r'name="csrf_token" type="hidden" value="([^"]+)"')
+IDEMPOTENCY_RE = re.compile(r'name="idempotency_key" type="hidden" value="([^"]*)"')
+LOCKED_MARKER = 'database is locked'
+
+
+# --- Metrics -----------------------------------------------------------------
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.locked = defaultdict(int)
+        self.rss_samples = []
+        self.burst_results = []
+        self.started = time.time()
+
+    def record(self, label, seconds, ok, locked):
+        with self._lock:
+            self.latencies[label].append(seconds)
+            if not ok:
+                self.errors[label] += 1
+            if locked:
+                self.locked[label] += 1
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+# --- HTTP client -------------------------------------------------------------
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+class Client:
+    """One browser session: cookie jar, no automatic redirects, timed requests"""
+
+    def __init__(self, base_url, metrics, timeout=60):
+        self.base_url = base_url.rstrip('/')
+        self.metrics = metrics
+        self.timeout = timeout
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()), _NoRedirect()
+        )
+        self.last_headers = {}
+
+    def request(self, label, path, data=None, headers=None, accept=()):
+        """Send a timed request; statuses in ``accept`` are not counted as errors"""
+        body = urllib.parse.urlencode(data, doseq=True).encode() if data is not None else None
+        req = urllib.request.Request(self.base_url + path, data=body, headers=headers or {})
+        start = time.perf_counter()
+        try:
+            with self.opener.open(req, timeout=self.timeout) as response:
+                status, text = response.status, response.read().decode('utf-8', 'replace')
+                self.last_headers = dict(response.headers)
+        except urllib.error.HTTPError as e:
+            status, text = e.code, e.read().decode('utf-8', 'replace')
+            self.last_headers = dict(e.headers)
+        except (urllib.error.URLError, socket.timeout, ConnectionError) as e:
+            status, text = 0, str(e)
+            self.last_headers = {}
+        elapsed = time.perf_counter() - start
+
+        locked = LOCKED_MARKER in text
+        # Failures are reported through flash messages on a 200 page as well
+        ok = status in accept or (0 < status < 500 and status not in (404,) and not locked
+                                  and 'Error creating' not in text and 'Error updating' not in text)
+        self.metrics.record(label, elapsed, ok, locked)
+        return status, text
+
+    def get(self, label, path, headers=None):
+        return self.request(label, path, headers=headers)
+
+    def prepare_form(self, label, form_path, data):
+        """GET a form page and return ``data`` with its CSRF token and idempotency key, or None"""
+        _, page = self.get(f'GET {label}', form_path)
+        token = CSRF_RE.search(page)
+        if not token:
+            return None
+        fields = dict(data, csrf_token=token.group(1))
+        key = IDEMPOTENCY_RE.search(page)
+        if key:
+            fields['idempotency_key'] = key.group(1)
+        return fields
+
+    def post_form(self, label, form_path, data, post_path=None):
+        """GET a form page for its CSRF token, then POST it"""
+        fields = self.prepare_form(label, form_path, data)
+        if fields is None:
+            return 0, ''
+        return self.request(f'POST {label}', post_path or form_path, data=fields)
+
+    def get_json(self, label, path):
+        status, text = self.get(label, path)
+        try:
+            return json.loads(text) if status == 200 else None
+        except ValueError:
+            return None
+
+
+# --- Scenarios ---------------------------------------------------------------
+
+def _slides(count):
+    words = 'revenue growth pipeline roadmap budget hiring launch metrics quality risk'.split()
+    return [
+        {'title': f'Slide {i}', 'content': '\n'.join(
+            '- ' + ' '.join(random.choice(words) for _ in range(random.randint(4, 12)))
+            for _ in range(random.randint(3, 8))
+        )}
+        for i in range(1, count + 1)
+    ]
+
+
+def _pick_weighted(actions):
+    total = sum(weight for weight, _ in actions)
+    point = random.uniform(0, total)
+    for weight, action in actions:
+        point -= weight
+        if point <= 0:
+            return action
+    return actions[-1][1]
+
+
+def _deck_form(title, slide_count):
+    return {
+        'title': title,
+        'description': 'Generated by the load test',
+        'agenda': 'Introduction\nResults\nNext steps',
+        'slides_data': json.dumps(_slides(slide_count)),
+    }
+
+
+def _register_and_login(client, username):
+    email = f'{username}@example.com'
+    client.post_form('/register', '/register', {
+        'username': username[:20], 'email': email, 'department': random.choice(['Sales', 'Eng', 'Ops', 'HR']),
+        'password': USER_PASSWORD, 'password2': USER_PASSWORD,
+    })
+    client.post_form('/login', '/login', {'email': email, 'password': USER_PASSWORD})
+
+
+def user_scenario(client, index, deadline, think, size_range):
+    username = f'lt{index}_{random.randint(0, 10 ** 6)}'
+    _register_and_login(client, username)
+
+    own = []
+
+    def create():
+        status, _ = client.post_form('/user/create', '/user/create',
+                                     _deck_form(f'{username} deck {len(own) + 1}', random.randint(*size_range)))
+        if status == 302:
+            listing = client.get_json('GET /api/presentations', '/api/presentations?fields=id&limit=1')
+            if listing and listing['items']:
+                own.append(listing['items'][0]['id'])
+
+    def edit():
+        if not own:
+            return create()
+        deck_id = random.choice(own)
+        client.post_form('/user/presentation/<id>/edit', f'/user/presentation/{deck_id}/edit',
+                         _deck_form(f'{username} deck {deck_id} v{random.randint(2, 10 ** 6)}',
+                                    random.randint(*size_range)))
+
+    def view():
+        if own:
+            client.get('GET /user/presentation/<id>', f'/user/presentation/{random.choice(own)}')
+
+    def poll():
+        if own:
+            client.get('GET /api/presentations/<id>/status', f'/api/presentations/{random.choice(own)}/status')
+
+    def download():
+        approved = client.get_json('GET /api/presentations',
+                                   '/api/presentations?status=approved&fields=id,current_version&limit=20')
+        if approved and approved['items']:
+            item = random.choice(approved['items'])
+            client.get('GET /user/download', f"/user/download/{item['id']}/{item['current_version']}")
+
+    actions = [
+        (30, create), (20, edit), (25, lambda: client.get('GET /user/dashboard', '/user/dashboard')),
+        (10, view), (10, poll), (5, download),
+    ]
+    while time.time() < deadline:
+        _pick_weighted(actions)()
+        time.sleep(random.uniform(0, think))
+
+
+def admin_scenario(client, index, deadline, think, size_range):
+    client.post_form('/login', '/login', {'email': ADMIN_EMAIL, 'password': ADMIN_PASSWORD})
+
+    def pending_ids():
+        listing = client.get_json('GET /api/presentations',
+                                  '/api/presentations?status=pending&fields=id,current_version&limit=20')
+        return listing['items'] if listing else []
+
+    def review():
+        items = pending_ids()
+        if items:
+            deck_id = random.choice(items)['id']
+            client.post_form('/admin/presentation/<id>/review', f'/admin/presentation/{deck_id}/review', {
+                'status': random.choice(['approved', 'approved', 'rejected']),
+                'feedback': 'Reviewed by load test',
+            })
+
+    def versions():
+        items = pending_ids()
+        if items:
+            client.get('GET /admin/presentation/<id>/versions',
+                       f"/admin/presentation/{random.choice(items)['id']}/versions")
+
+    def download():
+        items = pending_ids()
+        if items:
+            item = random.choice(items)
+            client.get('GET /user/download', f"/user/download/{item['id']}/{item['current_version']}")
+
+    actions = [
+        (20, lambda: client.get('GET /admin/dashboard', '/admin/dashboard')),
+        (20, lambda: client.get('GET /admin/presentations', '/admin/presentations?status=pending')),
+        (40, review), (10, versions), (10, download),
+    ]
+    while time.time() < deadline:
+        _pick_weighted(actions)()
+        time.sleep(random.uniform(0, think))
+
+
+def burst_scenario(client, index, start_at, barrier, slide_count, metrics):
+    """Submit one oversized deck at the same moment as every other burst client"""
+    username = f'burst{index}_{random.randint(0, 10 ** 6)}'
+    fields = None
+    try:
+        _register_and_login(client, username)
+        fields = client.prepare_form('/user/create', '/user/create', _deck_form(f'{username} burst', slide_count))
+        time.sleep(max(0.0, start_at - time.time()))
+    finally:
+        try:
+            barrier.wait(timeout=60)
+        except threading.BrokenBarrierError:
+            pass
+    if fields is None:
+        metrics.burst_results.append((0, None, time.time() - metrics.started))
+        return
+    status, _ = client.request('POST /user/create (burst)', '/user/create', data=fields, accept=(503,))
+    metrics.burst_results.append((status, client.last_headers.get('Retry-After'), time.time() - metrics.started))
+
+
+# --- Server management -------------------------------------------------------
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _server_env(work_dir, budget_mb=None, queue_timeout=None):
+    env = dict(os.environ)
+    env.update({
+        'DATABASE_URL': f"sqlite:///{os.path.join(work_dir, 'loadtest.db')}",
+        'UPLOAD_FOLDER': os.path.join(work_dir, 'ppts'),
+        'ASSET_FOLDER': os.path.join(work_dir, 'assets'),
+        'GENERATION_LEDGER': os.path.join(work_dir, 'admission.json'),
+        'SECRET_KEY': 'loadtest',
+    })
+    if budget_mb:
+        env['GENERATION_MEMORY_BUDGET'] = str(int(budget_mb * 1024 * 1024))
+    if queue_timeout is not None:
+        env['GENERATION_QUEUE_TIMEOUT'] = str(queue_timeout)
+    return env
+
+
+def seed_database(env, seed_users):
+    """Create the schema, the default admin and optional extra users before any worker starts"""
+    code = (
+        'import sys\n'
+        'from app import create_app, db\n'
+        'from app.models.user import User\n'
+        'app = create_app()\n'
+        'with app.app_context():\n'
+        f'    for i in range({seed_users}):\n'
+        "        user = User(username=f'seed{i}', email=f'seed{i}@example.com', department='Seed', role='user')\n"
+        f"        user.set_password('{USER_PASSWORD}')\n"
+        '        db.session.add(user)\n'
+        '    db.session.commit()\n'
+    )
+    subprocess.run([sys.executable, '-c', code], cwd=REPO_ROOT, env=env, check=True)
+
+
+def start_server(kind, port, env, workers, threads):
+    if kind == 'gunicorn':
+        cmd = [sys.executable, '-m', 'gunicorn', '-w', str(workers), '--threads', str(threads),
+               '-b', f'127.0.0.1:{port}', '--timeout', '120', 'run:app']
+    else:
+        # run.py's app, without the debugger and reloader
+        cmd = [sys.executable, '-c',
+               f"from run import app; app.run(host='127.0.0.1', port={port}, threaded=True, debug=False)"]
+    return subprocess.Popen(cmd, cwd=REPO_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def wait_until_ready(base_url, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(base_url + '/login', timeout=2)
+            return
+        except (urllib.error.URLError, ConnectionError, socket.timeout):
+            time.sleep(0.25)
+    raise RuntimeError(f'Server at {base_url} did not become ready')
+
+
+def _process_tree(root_pid):
+    children = defaultdict(list)
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children[ppid].append(int(entry))
+    pids, stack = [], [root_pid]
+    while stack:
+        pid = stack.pop()
+        pids.append(pid)
+        stack.extend(children.get(pid, []))
+    return pids
+
+
+def _rss_kb(pid):
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def sample_rss(pid, metrics, stop, interval):
+    """Record total RSS of the server process and its workers"""
+    while not stop.is_set():
+        pids = _process_tree(pid)
+        metrics.rss_samples.append((time.time() - metrics.started, sum(_rss_kb(p) for p in pids), len(pids)))
+        stop.wait(interval)
+
+
+# --- Report ------------------------------------------------------------------
+
+def build_burst_report(metrics, burst_at, max_rss_growth):
+    """Outcome of the burst and whether admission control held memory steady.
+
+    Growth is measured from the last RSS sample before the burst (after the
+    burst clients' logins) to the peak while burst submissions were in flight.
+    """
+    statuses = [status for status, _, _ in metrics.burst_results]
+    rejected = [retry_after for status, retry_after, _ in metrics.burst_results if status == 503]
+    burst_end = max((finished for _, _, finished in metrics.burst_results), default=burst_at)
+    before = [kb for t, kb, _ in metrics.rss_samples if t < burst_at]
+    during = [kb for t, kb, _ in metrics.rss_samples if burst_at <= t <= burst_end]
+    growth = round((max(during) - before[-1]) / 1024, 1) if before and during else None
+
+    checks = {
+        'rejections_carry_retry_after': all(retry_after for retry_after in rejected),
+        'no_unexpected_errors': all(status in (302, 503) for status in statuses),
+    }
+    if max_rss_growth is not None and growth is not None:
+        checks['rss_growth_within_limit'] = growth <= max_rss_growth
+    return {
+        'submissions': len(statuses),
+        'admitted': statuses.count(302),
+        'rejected_503': len(rejected),
+        'rejected_without_retry_after': sum(1 for retry_after in rejected if not retry_after),
+        'other_errors': sum(1 for status in statuses if status not in (302, 503)),
+        'rss_before_mb': round(before[-1] / 1024, 1) if before else None,
+        'rss_peak_during_mb': round(max(during) / 1024, 1) if during else None,
+        'rss_growth_mb': growth,
+        'max_rss_growth_mb': max_rss_growth,
+        'checks': checks,
+    }
+
+
+def build_report(metrics, duration, config):
+    endpoints = []
+    total_requests = total_errors = total_locked = 0
+    for label in sorted(metrics.latencies):
+        values = metrics.latencies[label]
+        total_requests += len(values)
+        total_errors += metrics.errors[label]
+        total_locked += metrics.locked[label]
+        endpoints.append({
+            'endpoint': label,
+            'requests': len(values),
+            'rps': round(len(values) / duration, 2),
+            'p50_ms': round(percentile(values, 50) * 1000, 1),
+            'p95_ms': round(percentile(values, 95) * 1000, 1),
+            'p99_ms': round(percentile(values, 99) * 1000, 1),
+            'error_rate': round(metrics.errors[label] / len(values), 4),
+            'db_locked': metrics.locked[label],
+        })
+    rss = [kb for _, kb, _ in metrics.rss_samples]
+    return {
+        'config': config,
+        'duration_s': round(duration, 1),
+        'requests': total_requests,
+        'throughput_rps': round(total_requests / duration, 2) if duration else 0,
+        'error_rate': round(total_errors / total_requests, 4) if total_requests else 0,
+        'db_locked': total_locked,
+        'endpoints': endpoints,
+        'rss_mb': {
+            'start': round(rss[0] / 1024, 1) if rss else None,
+            'peak': round(max(rss) / 1024, 1) if rss else None,
+            'end': round(rss[-1] / 1024, 1) if rss else None,
+            'samples': [(round(t, 1), round(kb / 1024, 1), procs) for t, kb, procs in metrics.rss_samples],
+        },
+    }
+
+
+def print_report(report):
+    config = report['config']
+    print(f"\nCapacity report: {config['server']} (workers={config['workers']}), "
+          f"{config['users']} users + {config['admins']} admins, {report['duration_s']}s")
+    print(f"Throughput: {report['throughput_rps']} req/s over {report['requests']} requests; "
+          f"error rate {report['error_rate'] * 100:.2f}%; 'database is locked': {report['db_locked']}\n")
+    print(f"{'endpoint':<48}{'reqs':>7}{'rps':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'err%':>7}{'locked':>8}")
+    for row in report['endpoints']:
+        print(f"{row['endpoint']:<48}{row['requests']:>7}{row['rps']:>8}{row['p50_ms']:>9}"
+              f"{row['p95_ms']:>9}{row['p99_ms']:>9}{row['error_rate'] * 100:>7.1f}{row['db_locked']:>8}")
+    rss = report['rss_mb']
+    if rss['samples']:
+        print(f"\nServer RSS (MB): start {rss['start']}, peak {rss['peak']}, end {rss['end']}")
+        step = max(1, len(rss['samples']) // 12)
+        print('  ' + '  '.join(f"{t:.0f}s:{mb}" for t, mb, _ in rss['samples'][::step]))
+    burst = report.get('burst')
+    if burst:
+        print(f"\nBurst at {report['config']['burst_at']}s: {burst['submissions']} decks of "
+              f"{report['config']['burst_slides']} slides; {burst['admitted']} admitted, "
+              f"{burst['rejected_503']} rejected with 503 ({burst['rejected_without_retry_after']} without "
+              f"Retry-After), {burst['other_errors']} other errors")
+        print(f"RSS before burst {burst['rss_before_mb']} MB, peak during burst "
+              f"{burst['rss_peak_during_mb']} MB (growth {burst['rss_growth_mb']} MB)")
+        for name, passed in burst['checks'].items():
+            print(f"  {'PASS' if passed else 'FAIL'}  {name}")
+
+
+# --- Main --------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--server', choices=['run', 'gunicorn'], default='run',
+                        help='Start run.py\'s app (threaded) or gunicorn on a seeded temporary database.')
+    parser.add_argument('--url', help='Target an already running instance instead of starting one.')
+    parser.add_argument('--pid', type=int, help='Server PID to sample RSS from when using --url.')
+    parser.add_argument('--workers', type=int, default=4, help='gunicorn worker processes.')
+    parser.add_argument('--threads', type=int, default=4, help='gunicorn threads per worker.')
+    parser.add_argument('--users', type=int, default=10, help='Concurrent submitting users.')
+    parser.add_argument('--admins', type=int, default=2, help='Concurrent reviewing admins.')
+    parser.add_argument('--duration', type=float, default=60, help='Seconds to run the scenarios.')
+    parser.add_argument('--think', type=float, default=0.5, help='Maximum think time between actions (s).')
+    parser.add_argument('--min-slides', type=int, default=3)
+    parser.add_argument('--max-slides', type=int, default=40)
+    parser.add_argument('--seed-users', type=int, default=0, help='Extra users created before the run.')
+    parser.add_argument('--rss-interval', type=float, default=1.0)
+    parser.add_argument('--burst', type=int, default=0, help='Oversized submissions sent at the same moment.')
+    parser.add_argument('--burst-slides', type=int, default=300, help='Slides per burst submission.')
+    parser.add_argument('--burst-at', type=float, default=None,
+                        help='Seconds into the run to send the burst (default: a third of --duration).')
+    parser.add_argument('--max-rss-growth', type=float, default=None,
+                        help='Fail if server RSS grows more than this many MB during the burst.')
+    parser.add_argument('--budget-mb', type=float, default=None,
+                        help='GENERATION_MEMORY_BUDGET for the started server, in MB.')
+    parser.add_argument('--queue-timeout', type=float, default=None,
+                        help='GENERATION_QUEUE_TIMEOUT for the started server, in seconds.')
+    parser.add_argument('--json', help='Also write the report to this file.')
+    parser.add_argument('--random-seed', type=int, default=None, help='Make scenario choices repeatable.')
+    args = parser.parse_args()
+
+    random.seed(args.random_seed)
+    metrics = Metrics()
+    exit_code = 0
+    work_dir = server = None
+    base_url, server_pid = args.url, args.pid
+
+    try:
+        if not base_url:
+            work_dir = tempfile.mkdtemp(prefix='pptgen-loadtest-')
+            env = _server_env(work_dir, args.budget_mb, args.queue_timeout)
+            seed_database(env, args.seed_users)
+            port = _free_port()
+            server = start_server(args.server, port, env, args.workers, args.threads)
+            server_pid = server.pid
+            base_url = f'http://127.0.0.1:{port}'
+        wait_until_ready(base_url)
+
+        stop = threading.Event()
+        metrics.started = time.time()
+        if server_pid:
+            threading.Thread(target=sample_rss, args=(server_pid, metrics, stop, args.rss_interval),
+                             daemon=True).start()
+
+        started = metrics.started
+        deadline = started + args.duration
+        burst_at = args.duration / 3 if args.burst_at is None else args.burst_at
+        barrier = threading.Barrier(args.burst) if args.burst else None
+        size_range = (args.min_slides, args.max_slides)
+        threads = [
+            threading.Thread(target=user_scenario, args=(Client(base_url, metrics), i, deadline, args.think, size_range))
+            for i in range(args.users)
+        ] + [
+            threading.Thread(target=admin_scenario, args=(Client(base_url, metrics), i, deadline, args.think, size_range))
+            for i in range(args.admins)
+        ] + [
+            threading.Thread(target=burst_scenario,
+                             args=(Client(base_url, metrics), i, started + burst_at, barrier, args.burst_slides, metrics))
+            for i in range(args.burst)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        duration = time.time() - started
+        stop.set()
+
+        report = build_report(metrics, duration, {
+            'server': 'external' if args.url else args.server,
+            'workers': args.workers if args.server == 'gunicorn' and not args.url else 1,
+            'users': args.users,
+            'admins': args.admins,
+            'slides': list(size_range),
+            'burst': args.burst,
+            'burst_slides': args.burst_slides,
+            'burst_at': round(burst_at, 1),
+        })
+        if args.burst:
+            report['burst'] = build_burst_report(metrics, burst_at, args.max_rss_growth)
+        print_report(report)
+        if args.json:
+            with open(args.json, 'w') as f:
+                json.dump(report, f, indent=2)
+        if args.burst and not all(report['burst']['checks'].values()):
+            exit_code = 1
+    finally:
+        if server:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+        if work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())